@@ -6,6 +6,7 @@ with automatic JWT authentication, retry logic, and typed responses.
 
 import asyncio
 import logging
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Set
 from datetime import datetime, timezone
 
@@ -18,6 +19,15 @@ from ..core.auth import AuthenticationError, AuthorizationError
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1024)
+def _parse_iso(value: str) -> Optional[datetime]:
+    """Parse an ISO-8601 string, caching results for repeated timestamps."""
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (ValueError, AttributeError):
+        return None
+
+
 class QueryResult(BaseModel):
     """Result of a BigQuery query execution."""
     query_id: Optional[str] = None
@@ -588,10 +598,7 @@ class MCPBigQueryClient:
         if isinstance(value, datetime):
             return value
         if isinstance(value, str):
-            try:
-                return datetime.fromisoformat(value.replace("Z", "+00:00"))
-            except (ValueError, AttributeError):
-                return None
+            return _parse_iso(value)
         if isinstance(value, (int, float)):
             try:
                 return datetime.fromtimestamp(value, tz=timezone.utc)
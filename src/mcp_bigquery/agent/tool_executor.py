@@ -4,6 +4,7 @@ This module handles the execution of tool calls requested by the LLM,
 including error handling and result formatting for both OpenAI and Anthropic.
 """
 
+import asyncio
 import json
 import logging
 from typing import List, Dict, Any
@@ -42,7 +43,9 @@ class ToolExecutor:
         self,
         tool_calls: List[ToolCall]
     ) -> List[Dict[str, Any]]:
-        """Execute multiple tool calls and return results.
+        """Execute multiple tool calls concurrently and return results.
+        
+        Results are returned in the same order as ``tool_calls``.
         
         Args:
             tool_calls: List of ToolCall objects from LLM
@@ -50,13 +53,9 @@ class ToolExecutor:
         Returns:
             List of result dictionaries with tool_call_id, tool_name, success, and result/error
         """
-        results = []
-        
-        for tool_call in tool_calls:
-            result = await self.execute_single_tool(tool_call)
-            results.append(result)
-        
-        return results
+        return list(await asyncio.gather(
+            *(self.execute_single_tool(tool_call) for tool_call in tool_calls)
+        ))
     
     async def execute_single_tool(
         self,
@@ -86,7 +85,6 @@ class ToolExecutor:
                 raise ValueError(f"Unknown tool: {tool_name}")
             
             # Ensure handler is a coroutine function
-            import asyncio
             if not asyncio.iscoroutinefunction(tool.handler):
                 raise ValueError(f"Tool handler for {tool_name} is not async")
             
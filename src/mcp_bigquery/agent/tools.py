@@ -49,6 +49,7 @@ class ToolRegistry:
         """
         self.mcp_client = mcp_client
         self.tools = self._register_tools()
+        self._llm_tools_cache: Dict[str, List[ToolDefinition]] = {}
     
     def _register_tools(self) -> List[Tool]:
         """Register all available tools.
@@ -159,17 +160,22 @@ class ToolRegistry:
             provider: LLM provider name ("openai", "anthropic", etc.)
             
         Returns:
-            List of ToolDefinition objects compatible with the LLM provider
+            List of ToolDefinition objects compatible with the LLM provider.
+            The list is built once per provider and reused on later calls.
             
         Raises:
             ValueError: If provider is not supported
         """
+        cached = self._llm_tools_cache.get(provider)
+        if cached is not None:
+            return cached
+        
         if provider not in ("openai", "anthropic"):
             raise ValueError(f"Unsupported provider: {provider}")
         
         # Both OpenAI and Anthropic use the same ToolDefinition format
         # The actual provider-specific formatting is handled by the LLM provider classes
-        return [
+        definitions = [
             ToolDefinition(
                 name=tool.name,
                 description=tool.description,
@@ -177,6 +183,8 @@ class ToolRegistry:
             )
             for tool in self.tools
         ]
+        self._llm_tools_cache[provider] = definitions
+        return definitions
     
     def get_tool_by_name(self, name: str) -> Optional[Tool]:
         """Get tool by name.
@@ -4,6 +4,9 @@ import os
 from typing import Optional
 from pydantic import BaseModel, Field, field_validator
 
+# MCP_VERIFY_SSL values (lowercased) that enable verification
+_TRUTHY = frozenset({'true', '1', 'yes'})
+
 
 class ClientConfig(BaseModel):
     """Configuration for MCP BigQuery client.
@@ -56,6 +59,11 @@ class ClientConfig(BaseModel):
             raise ValueError("max_retries must be non-negative")
         return v
     
+    @staticmethod
+    def _parse_verify_ssl(value: str) -> bool:
+        """Parse an MCP_VERIFY_SSL string ("true", "1", "yes" are truthy)."""
+        return value.lower() in _TRUTHY
+    
     @classmethod
     def from_env(cls, **overrides) -> "ClientConfig":
         """Create configuration from environment variables.
@@ -80,7 +88,7 @@ class ClientConfig(BaseModel):
             'timeout': float(os.getenv('MCP_TIMEOUT', '30.0')),
             'max_retries': int(os.getenv('MCP_MAX_RETRIES', '3')),
             'retry_delay': float(os.getenv('MCP_RETRY_DELAY', '1.0')),
-            'verify_ssl': os.getenv('MCP_VERIFY_SSL', 'true').lower() in ('true', '1', 'yes'),
+            'verify_ssl': cls._parse_verify_ssl(os.getenv('MCP_VERIFY_SSL', 'true')),
         }
         
         # Apply overrides
@@ -23,8 +23,10 @@ class MCPClient:
     """Async client for interacting with the MCP BigQuery server.
     
     This client is designed to work in Streamlit's environment where each request
-    may occur in a different event loop. We create a new httpx client for each
-    request rather than maintaining a persistent one.
+    may occur in a different event loop. Used on its own, it creates a new httpx
+    client for each request. Used as an async context manager, it holds one
+    pooled httpx client for the lifetime of the ``async with`` block, so
+    requests in the same event loop reuse connections.
     
     Example:
         ```python
@@ -38,6 +40,11 @@ class MCPClient:
         client = MCPClient(config)
         datasets = await client.list_datasets()
         result = await client.execute_sql("SELECT 1")
+        
+        # Reuse one connection pool across several requests
+        async with MCPClient(config) as client:
+            datasets = await client.list_datasets()
+            result = await client.execute_sql("SELECT 1")
         ```
     """
     
@@ -48,28 +55,44 @@ class MCPClient:
             config: Client configuration
         """
         self.config = config
-        # DO NOT create httpx client here - create per request
+        # Persistent client, only set inside ``async with`` (see __aenter__)
+        self._client: Optional[httpx.AsyncClient] = None
     
     async def __aenter__(self) -> "MCPClient":
-        """Async context manager entry."""
+        """Async context manager entry; opens a pooled httpx client."""
+        if self._client is None:
+            self._client = self._new_client(
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+            )
+            logger.debug("Opened persistent httpx client")
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit."""
-        pass
+        """Async context manager exit; closes the pooled httpx client."""
+        await self.close()
+    
+    def _new_client(self, **kwargs: Any) -> httpx.AsyncClient:
+        """Build an httpx client with this config's timeout, SSL and headers."""
+        return httpx.AsyncClient(
+            timeout=self.config.timeout,
+            verify=self.config.verify_ssl,
+            headers=self._get_headers(),
+            **kwargs
+        )
     
     @asynccontextmanager
     async def _get_client(self):
-        """Create a fresh httpx client for this request's event loop.
+        """Yield the persistent client, or a fresh one for this request.
         
-        This ensures the client and event loop have matching lifetimes,
-        preventing "Event loop is closed" errors in Streamlit.
+        Outside ``async with`` a new client is created and closed per request,
+        so the client and event loop have matching lifetimes, preventing
+        "Event loop is closed" errors in Streamlit.
         """
-        client = httpx.AsyncClient(
-            timeout=self.config.timeout,
-            verify=self.config.verify_ssl,
-            headers=self._get_headers()
-        )
+        if self._client is not None:
+            yield self._client
+            return
+        
+        client = self._new_client()
         try:
             logger.debug("Created new httpx client for request")
             yield client
@@ -78,8 +101,11 @@ class MCPClient:
             logger.debug("Closed httpx client after request")
     
     async def close(self):
-        """Close method for backwards compatibility (no-op now)."""
-        pass
+        """Close the persistent httpx client, if one is open."""
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
+            logger.debug("Closed persistent httpx client")
     
     def _get_headers(self) -> Dict[str, str]:
         """Get HTTP headers including authentication."""
@@ -121,7 +147,8 @@ class MCPClient:
         """
         url = f"{self.config.base_url}{path}"
         
-        # Create fresh client for THIS request's event loop
+        # Reuse the pooled client inside `async with`; otherwise use a per-request
+        # client bound to this call's event loop (e.g. under Streamlit)
         async with self._get_client() as client:
             try:
                 logger.debug(f"{method} {path} params={params} json={json_data}")
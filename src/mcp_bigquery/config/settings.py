@@ -1,8 +1,10 @@
 """Configuration settings for the MCP BigQuery server."""
 import os
 import json
+import stat
+from functools import lru_cache
 from typing import Optional
-from pydantic import BaseModel, Field, field_validator, model_validator
+from pydantic import BaseModel, Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from dotenv import load_dotenv
 
@@ -10,6 +12,34 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+@lru_cache(maxsize=128)
+def _validate_key_file(path: str, mtime_ns: int, size: int) -> Optional[str]:
+    """Check a service account key file, returning an error message or None.
+
+    ``mtime_ns`` and ``size`` are only part of the cache key, so a file that
+    is rewritten gets checked again.
+    """
+    try:
+        with open(path, "r") as f:
+            key_data = json.load(f)
+    except json.JSONDecodeError:
+        return "Service account key file is not valid JSON"
+    except OSError:
+        return f"Key file '{path}' not found or inaccessible"
+    if (
+        not isinstance(key_data, dict)
+        or key_data.get("type") != "service_account"
+        or "project_id" not in key_data
+    ):
+        return "Invalid service account key file format"
+    return None
+
+
+def clear_key_file_cache() -> None:
+    """Forget cached key file checks, e.g. after editing a file in place."""
+    _validate_key_file.cache_clear()
+
+
 class ServerConfig(BaseSettings):
     """Configuration class to store server configurations.
     
@@ -48,27 +78,20 @@ class ServerConfig(BaseSettings):
     @field_validator('key_file')
     @classmethod
     def validate_key_file(cls, v: Optional[str]) -> Optional[str]:
-        """Validate key file exists and is accessible."""
-        if v and not os.path.isfile(v):
+        """Validate key file exists and is a service account key."""
+        if not v:
+            return v
+        try:
+            st = os.stat(v)
+        except OSError:
+            st = None
+        if st is None or not stat.S_ISREG(st.st_mode):
             raise ValueError(f"Key file '{v}' not found or inaccessible")
+        error = _validate_key_file(v, st.st_mtime_ns, st.st_size)
+        if error:
+            raise ValueError(error)
         return v
 
-    @model_validator(mode='after')
-    def validate_key_file_format(self) -> 'ServerConfig':
-        """Validate service account key file format if provided."""
-        if self.key_file:
-            try:
-                with open(self.key_file, "r") as f:
-                    key_data = json.load(f)
-                if (
-                    key_data.get("type") != "service_account"
-                    or "project_id" not in key_data
-                ):
-                    raise ValueError("Invalid service account key file format")
-            except json.JSONDecodeError:
-                raise ValueError("Service account key file is not valid JSON")
-        return self
-
     def validate(self) -> None:
         """Legacy validate method for backward compatibility."""
         # Validation is now done automatically by Pydantic
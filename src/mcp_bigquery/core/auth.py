@@ -12,10 +12,18 @@ Environment Variables:
 import os
 import jwt
 from datetime import datetime, timedelta, timezone
-from typing import Optional, List, Dict, Any, Set
+from typing import TYPE_CHECKING, Optional, List, Dict, Any, Set
 from functools import lru_cache
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 
+if TYPE_CHECKING:
+    from jwt.types import Options
+
+# jwt.decode arguments, built once rather than on every request.
+# Shared by every decode call: treat _JWT_OPTIONS as read-only.
+_JWT_ALGORITHMS = ("HS256",)
+_JWT_OPTIONS: "Options" = {"verify_exp": True}
+
 
 class AuthenticationError(Exception):
     """Raised when JWT validation fails."""
@@ -197,9 +205,9 @@ class UserContext(BaseModel):
             payload = jwt.decode(
                 token,
                 secret,
-                algorithms=["HS256"],
+                algorithms=_JWT_ALGORITHMS,
                 audience="authenticated",
-                options={"verify_exp": True},
+                options=_JWT_OPTIONS,
                 leeway=10
             )
         except jwt.ExpiredSignatureError:
@@ -272,9 +280,9 @@ class UserContext(BaseModel):
             payload = jwt.decode(
                 token,
                 secret,
-                algorithms=["HS256"],
+                algorithms=_JWT_ALGORITHMS,
                 audience="authenticated",
-                options={"verify_exp": True},
+                options=_JWT_OPTIONS,
                 leeway=10
             )
         except jwt.ExpiredSignatureError:
@@ -307,12 +315,16 @@ class UserContext(BaseModel):
 async def _hydrate_user_context(context: UserContext, supabase_kb: Any) -> None:
     """Hydrate user context with roles and permissions from Supabase.
     
+    All RBAC data is loaded with a single ``get_user_authz_bundle`` call.
+    
     Args:
         context: UserContext to populate
         supabase_kb: SupabaseKnowledgeBase instance
     """
+    bundle = await supabase_kb.get_user_authz_bundle(context.user_id)
+    
     # Load user profile
-    profile_data = await supabase_kb.get_user_profile(context.user_id)
+    profile_data = bundle.get("profile")
     if profile_data:
         try:
             profile = UserProfile(**profile_data)
@@ -323,59 +335,50 @@ async def _hydrate_user_context(context: UserContext, supabase_kb: Any) -> None:
             context.metadata.update(profile_data.get("metadata", {}))
     
     # Load user roles
-    user_roles_data = await supabase_kb.get_user_roles(context.user_id)
-    user_roles = []
-    for role_data in user_roles_data:
+    for role_data in bundle.get("roles", []):
         try:
             role = UserRole(**role_data)
-            user_roles.append(role)
             context.roles.append(role.role_name)
         except Exception as e:
             print(f"Warning: Failed to validate user role: {e}")
             # Fallback to raw data
             context.roles.append(role_data.get("role_name", ""))
     
-    # Load permissions and dataset access for each role
-    for role in user_roles:
-        role_id = role.role_id
-        
-        # Load role permissions
-        permissions_data = await supabase_kb.get_role_permissions(role_id)
-        for perm_data in permissions_data:
-            try:
-                perm = RolePermission(**perm_data)
-                context.permissions.add(perm.permission)
-            except Exception as e:
-                print(f"Warning: Failed to validate permission: {e}")
-                # Fallback to raw data
-                context.permissions.add(perm_data.get("permission", ""))
-        
-        # Load dataset/table access
-        dataset_access_data = await supabase_kb.get_role_dataset_access(role_id)
-        for access_data in dataset_access_data:
-            try:
-                access = DatasetAccess(**access_data)
-                dataset_id = normalize_identifier(access.dataset_id)
+    # Load permissions across all roles
+    for perm_data in bundle.get("permissions", []):
+        try:
+            perm = RolePermission(**perm_data)
+            context.permissions.add(perm.permission)
+        except Exception as e:
+            print(f"Warning: Failed to validate permission: {e}")
+            # Fallback to raw data
+            context.permissions.add(perm_data.get("permission", ""))
+    
+    # Load dataset/table access across all roles
+    for access_data in bundle.get("datasets", []):
+        try:
+            access = DatasetAccess(**access_data)
+            dataset_id = normalize_identifier(access.dataset_id)
+            context.allowed_datasets.add(dataset_id)
+            
+            # Handle table-level access
+            if access.table_id:
+                if dataset_id not in context.allowed_tables:
+                    context.allowed_tables[dataset_id] = set()
+                table_id = normalize_identifier(access.table_id)
+                context.allowed_tables[dataset_id].add(table_id)
+        except Exception as e:
+            print(f"Warning: Failed to validate dataset access: {e}")
+            # Fallback to raw data
+            dataset_id = normalize_identifier(access_data.get("dataset_id", ""))
+            if dataset_id:
                 context.allowed_datasets.add(dataset_id)
                 
-                # Handle table-level access
-                if access.table_id:
+                if "table_id" in access_data and access_data["table_id"]:
                     if dataset_id not in context.allowed_tables:
                         context.allowed_tables[dataset_id] = set()
-                    table_id = normalize_identifier(access.table_id)
+                    table_id = normalize_identifier(access_data["table_id"])
                     context.allowed_tables[dataset_id].add(table_id)
-            except Exception as e:
-                print(f"Warning: Failed to validate dataset access: {e}")
-                # Fallback to raw data
-                dataset_id = normalize_identifier(access_data.get("dataset_id", ""))
-                if dataset_id:
-                    context.allowed_datasets.add(dataset_id)
-                    
-                    if "table_id" in access_data and access_data["table_id"]:
-                        if dataset_id not in context.allowed_tables:
-                            context.allowed_tables[dataset_id] = set()
-                        table_id = normalize_identifier(access_data["table_id"])
-                        context.allowed_tables[dataset_id].add(table_id)
 
 
 def normalize_identifier(identifier: str) -> str:
@@ -447,9 +450,9 @@ def verify_token(token: str, jwt_secret: Optional[str] = None) -> Dict[str, Any]
         payload = jwt.decode(
             token,
             secret,
-            algorithms=["HS256"],
+            algorithms=_JWT_ALGORITHMS,
             audience="authenticated",
-            options={"verify_exp": True},
+            options=_JWT_OPTIONS,
             leeway=10
         )
         return payload
@@ -641,7 +641,67 @@ class SupabaseKnowledgeBase:
         except Exception as e:
             print(f"Error fetching role dataset access: {e}")
             return []
-    
+
+    async def get_user_authz_bundle(self, user_id: str) -> Dict[str, Any]:
+        """Retrieve a user's profile, roles, permissions and dataset access at once.
+
+        Permissions and dataset access are fetched for all of the user's roles
+        with one ``role_id IN (...)`` query each, instead of one query per role.
+
+        Args:
+            user_id: User ID from Supabase auth
+
+        Returns:
+            Dict with ``profile`` (dict or None), ``roles``, ``permissions``
+            and ``datasets`` (lists of row dicts across all roles). If a
+            query fails, the rows fetched before it are kept, the rest stay
+            empty, and the partial result is not cached.
+        """
+        bundle: Dict[str, Any] = {"profile": None, "roles": [], "permissions": [], "datasets": []}
+        if not await self.verify_connection():
+            return bundle
+
+        # Check cache first
+        from .auth import _get_cached_role_data, _set_cached_role_data
+        cache_key = f"user_authz:{user_id}"
+        cached: Optional[Dict[str, Any]] = _get_cached_role_data(cache_key)
+        if cached is not None:
+            return cached
+
+        try:
+            profile = self.supabase.table("user_profiles") \
+                .select("*") \
+                .eq("user_id", user_id) \
+                .limit(1) \
+                .execute()
+            bundle["profile"] = profile.data[0] if profile.data else None
+
+            roles = self.supabase.table("user_roles") \
+                .select("*") \
+                .eq("user_id", user_id) \
+                .execute()
+            bundle["roles"] = roles.data or []
+
+            role_ids = [role["role_id"] for role in bundle["roles"] if role.get("role_id")]
+            if role_ids:
+                permissions = self.supabase.table("role_permissions") \
+                    .select("*") \
+                    .in_("role_id", role_ids) \
+                    .execute()
+                bundle["permissions"] = permissions.data or []
+
+                datasets = self.supabase.table("role_dataset_access") \
+                    .select("*") \
+                    .in_("role_id", role_ids) \
+                    .execute()
+                bundle["datasets"] = datasets.data or []
+
+            _set_cached_role_data(cache_key, bundle)
+            return bundle
+        except Exception as e:
+            print(f"Error fetching user authorization data: {e}")
+            return bundle
+
     # Chat Session Management Methods
     
     async def create_chat_session(
@@ -1673,19 +1733,30 @@ class SupabaseKnowledgeBase:
         session_id: str,
         user_id: str,
         limit: Optional[int] = None
-    ) -> List[Dict[str, Any]]:
+    ) -> Optional[List[Dict[str, Any]]]:
         """Fetch chat history for a session in chronological order.
         
+        Unlike the other chat methods, failures are not swallowed: a missing
+        or unowned session returns None, but an unreachable Supabase or a
+        failed query raises, so callers can tell "no such session" from
+        "could not read it".
+        
         Args:
             session_id: Session UUID
             user_id: User ID for ownership validation
             limit: Optional maximum number of messages to return
             
         Returns:
-            List of message dicts ordered by ordering field
+            List of message dicts ordered by ordering field (empty if the
+            session has no messages), or None if the session does not exist
+            or is not owned by the user
+            
+        Raises:
+            ConnectionError: If Supabase is not reachable
+            Exception: If the session or message query fails
         """
         if not await self.verify_connection():
-            return []
+            raise ConnectionError("Supabase connection is not available")
         
         try:
             # Validate session ownership
@@ -1697,11 +1768,11 @@ class SupabaseKnowledgeBase:
             
             if not session_result.data:
                 print(f"Session not found: {session_id}")
-                return []
+                return None
             
             if session_result.data[0]["user_id"] != user_id:
                 print(f"Session ownership validation failed")
-                return []
+                return None
             
             # Fetch messages
             query = self.supabase.table("chat_messages") \
@@ -1718,7 +1789,7 @@ class SupabaseKnowledgeBase:
             
         except Exception as e:
             print(f"Error fetching chat history: {e}")
-            return []
+            raise
     
     async def rename_session(
         self,
@@ -5,10 +5,14 @@ enabling consistent interaction with different LLM services (OpenAI, Anthropic,
 while abstracting provider-specific details.
 """
 
+import json
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional, Union
 from pydantic import BaseModel, Field, field_validator
 
+# Compact JSON encoder for tool-call arguments (no whitespace, UTF-8 kept as-is)
+_ENC = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+
 
 class LLMProviderError(Exception):
     """Base exception for LLM provider errors."""
@@ -49,6 +53,19 @@ class ToolCall(BaseModel):
     name: str
     arguments: Dict[str, Any] = Field(default_factory=dict)
 
+    @property
+    def openai_dict(self) -> Dict[str, Any]:
+        """OpenAI-format ``tool_calls`` entry with compact JSON arguments.
+
+        Built on every access, so it reflects the current fields and each
+        outgoing message gets its own dict.
+        """
+        return {
+            "id": self.id,
+            "type": "function",
+            "function": {"name": self.name, "arguments": _ENC(self.arguments)},
+        }
+
 
 class GenerationResponse(BaseModel):
     """Standardized response from LLM generation."""
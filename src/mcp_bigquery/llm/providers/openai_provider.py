@@ -4,6 +4,7 @@ This module provides an implementation of the LLMProvider interface
 for OpenAI's API using the official OpenAI SDK (v1.x).
 """
 
+import json
 import tiktoken
 from typing import Any, Dict, List, Optional
 from pydantic import Field
@@ -23,6 +24,34 @@ from .base import (
 )
 
 
+def _to_openai_messages(messages: List[Message]) -> List[Dict[str, Any]]:
+    """Convert standard messages to OpenAI chat completion message dicts.
+    
+    Args:
+        messages: List of conversation messages
+        
+    Returns:
+        List of OpenAI-format message dictionaries
+    """
+    openai_messages = []
+    for msg in messages:
+        openai_msg: Dict[str, Any] = {
+            "role": msg.role,
+            "content": msg.content
+        }
+        
+        # Add tool_calls for assistant messages
+        if msg.role == "assistant" and msg.tool_calls:
+            openai_msg["tool_calls"] = [tc.openai_dict for tc in msg.tool_calls]
+        
+        # Add tool_call_id for tool messages
+        if msg.role == "tool" and msg.tool_call_id:
+            openai_msg["tool_call_id"] = msg.tool_call_id
+        
+        openai_messages.append(openai_msg)
+    return openai_messages
+
+
 class OpenAIProviderConfig(LLMProviderConfig):
     """Configuration for OpenAI provider."""
     model: str = Field(default="gpt-4o")
@@ -84,33 +113,7 @@ class OpenAIProvider(LLMProvider):
             LLMGenerationError: If generation fails
         """
         try:
-            openai_messages = []
-            for msg in messages:
-                openai_msg: Dict[str, Any] = {
-                    "role": msg.role,
-                    "content": msg.content
-                }
-                
-                # Add tool_calls for assistant messages
-                if msg.role == "assistant" and msg.tool_calls:
-                    import json
-                    openai_msg["tool_calls"] = [
-                        {
-                            "id": tc.id,
-                            "type": "function",
-                            "function": {
-                                "name": tc.name,
-                                "arguments": json.dumps(tc.arguments)
-                            }
-                        }
-                        for tc in msg.tool_calls
-                    ]
-                
-                # Add tool_call_id for tool messages
-                if msg.role == "tool" and msg.tool_call_id:
-                    openai_msg["tool_call_id"] = msg.tool_call_id
-                
-                openai_messages.append(openai_msg)
+            openai_messages = _to_openai_messages(messages)
             
             request_params: Dict[str, Any] = {
                 "model": self.config.model,
@@ -144,7 +147,6 @@ class OpenAIProvider(LLMProvider):
             tool_calls_list = []
             if message.tool_calls:
                 for tc in message.tool_calls:
-                    import json
                     try:
                         arguments = json.loads(tc.function.arguments)
                     except json.JSONDecodeError:
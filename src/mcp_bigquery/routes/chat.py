@@ -1,5 +1,6 @@
 """Chat persistence API routes."""
 
+import logging
 from typing import Optional, Dict, Any, List
 from fastapi import APIRouter, Depends, HTTPException, Body, Path, Query
 from pydantic import BaseModel, Field
@@ -7,6 +8,8 @@ from pydantic import BaseModel, Field
 from ..core.auth import UserContext
 from ..core.supabase_client import SupabaseKnowledgeBase
 
+logger = logging.getLogger(__name__)
+
 
 class CreateSessionRequest(BaseModel):
     """Request model for creating a chat session."""
@@ -278,24 +281,28 @@ def create_chat_router(
             List of messages ordered by ordering field
             
         Raises:
-            HTTPException: 404 if session not found or unauthorized
+            HTTPException: 404 if session not found or unauthorized,
+                500 if the history could not be read
         """
-        messages = await knowledge_base.fetch_chat_history(
-            session_id=session_id,
-            user_id=user.user_id,
-            limit=limit
-        )
+        try:
+            messages = await knowledge_base.fetch_chat_history(
+                session_id=session_id,
+                user_id=user.user_id,
+                limit=limit
+            )
+        except Exception as e:
+            logger.error(f"Error fetching chat history for session {session_id}: {e}", exc_info=True)
+            raise HTTPException(
+                status_code=500,
+                detail="Failed to fetch chat history"
+            ) from e
         
-        # If messages is empty, verify the session exists
-        if not messages:
-            sessions = await knowledge_base.list_chat_sessions(user_id=user.user_id)
-            session = next((s for s in sessions if s.get("id") == session_id), None)
-            
-            if not session:
-                raise HTTPException(
-                    status_code=404,
-                    detail="Session not found or access denied"
-                )
+        # None means the session is missing or not owned; [] is an empty session
+        if messages is None:
+            raise HTTPException(
+                status_code=404,
+                detail="Session not found or access denied"
+            )
         
         return messages
 
@@ -0,0 +1,96 @@
+"""Shared fixtures for agent tests."""
+
+import json
+
+import httpx
+import pandas  # noqa: F401  # warm pandas once for the whole package
+import pytest
+
+import mcp_bigquery.agent.summarizer  # noqa: F401
+from mcp_bigquery.agent.mcp_client import MCPBigQueryClient
+
+
+def _mcp_text(payload):
+    """Wrap a payload in an MCP-style text content response body."""
+    return {"content": [{"type": "text", "text": json.dumps(payload)}], "isError": False}
+
+
+_EXEC_SQL_BODY = _mcp_text({
+    "query_id": "query-123",
+    "result": [{"id": 1, "name": "Alice"}],
+    "statistics": {"totalBytesProcessed": 1024},
+    "cached": False,
+})
+
+_DATASETS_BODY = _mcp_text({
+    "datasets": [
+        {
+            "datasetId": "dataset1",
+            "projectId": "project1",
+            "location": "US",
+            "description": "Test dataset",
+        }
+    ]
+})
+
+_TABLES_BODY = {
+    "tables": [
+        {
+            "tableId": "table1",
+            "projectId": "project1",
+            "type": "TABLE",
+            "numRows": 1000,
+        }
+    ]
+}
+
+_TABLE_SCHEMA_BODY = _mcp_text({
+    "projectId": "project1",
+    "schema": [
+        {"name": "id", "type": "INTEGER"},
+        {"name": "name", "type": "STRING"},
+    ],
+    "numRows": 1000,
+    "sampleRows": [{"id": 1, "name": "Alice"}],
+})
+
+_HEALTH_BODY = {
+    "status": "healthy",
+    "timestamp": 1234567890.0,
+    "connections": {"total": 5},
+}
+
+# Canonical response for each MCP server endpoint, keyed by request path.
+# Tests that need a different response override a single entry with
+# ``monkeypatch.setitem(mcp_routes, path, handler)``.
+_ROUTES = {
+    "/tools/query": lambda request: httpx.Response(200, json=_EXEC_SQL_BODY),
+    "/tools/datasets": lambda request: httpx.Response(200, json=_DATASETS_BODY),
+    "/tools/tables": lambda request: httpx.Response(200, json=_TABLES_BODY),
+    "/tools/table_schema": lambda request: httpx.Response(200, json=_TABLE_SCHEMA_BODY),
+    "/health": lambda request: httpx.Response(200, json=_HEALTH_BODY),
+}
+
+
+@pytest.fixture
+def mcp_routes():
+    """Route table used by the shared MCP transport."""
+    return _ROUTES
+
+
+@pytest.fixture(scope="session")
+def transport():
+    """Single mock transport dispatching every request through ``_ROUTES``."""
+    def handler(request):
+        return _ROUTES[request.url.path](request)
+
+    return httpx.MockTransport(handler)
+
+
+@pytest.fixture
+async def mcp_client(transport):
+    """MCPBigQueryClient wired to the shared mock transport, closed on teardown."""
+    client = MCPBigQueryClient("http://localhost:8000", auth_token="test-jwt-token")
+    client._client = httpx.AsyncClient(transport=transport, timeout=client.timeout)
+    yield client
+    await client.close()
@@ -37,9 +37,9 @@ def mock_mcp_client():
     """Create a mock MCP client."""
     client = MagicMock()
     client.execute_sql = AsyncMock()
-    client.list_datasets = AsyncMock()
-    client.list_tables = AsyncMock()
-    client.get_table_schema = AsyncMock()
+    client.list_datasets = AsyncMock(return_value={"datasets": []})
+    client.list_tables = AsyncMock(return_value={"tables": []})
+    client.get_table_schema = AsyncMock(return_value={"schema": []})
     return client
 
 
@@ -13,6 +13,10 @@ from mcp_bigquery.agent.models import (
 )
 
 
+_EMPTY_CTX_KWARGS = {"session_id": "session-123", "user_id": "user-456"}
+_BASE_REQUEST_KWARGS = {"question": "Test", **_EMPTY_CTX_KWARGS}
+
+
 class TestChartSuggestion:
     """Tests for ChartSuggestion model."""
     
@@ -125,17 +129,17 @@ class TestConversationContext:
         
         assert "ID cannot be empty" in str(exc_info.value)
     
-    def test_defaults(self):
+    @pytest.mark.parametrize("attr, expected", [
+        ("messages", []),
+        ("allowed_datasets", set()),
+        ("allowed_tables", {}),
+        ("metadata", {}),
+    ])
+    def test_defaults(self, attr, expected):
         """Test default values."""
-        context = ConversationContext(
-            session_id="session-123",
-            user_id="user-456"
-        )
+        context = ConversationContext(**_EMPTY_CTX_KWARGS)
         
-        assert context.messages == []
-        assert context.allowed_datasets == set()
-        assert context.allowed_tables == {}
-        assert context.metadata == {}
+        assert getattr(context, attr) == expected
 
 
 class TestAgentRequest:
@@ -188,17 +192,16 @@ class TestAgentRequest:
                 context_turns=-1
             )
     
-    def test_defaults(self):
+    @pytest.mark.parametrize("attr, expected", [
+        ("context_turns", 5),
+        ("allowed_datasets", set()),
+        ("metadata", {}),
+    ])
+    def test_defaults(self, attr, expected):
         """Test default values."""
-        request = AgentRequest(
-            question="Test",
-            session_id="session-123",
-            user_id="user-456"
-        )
+        request = AgentRequest(**_BASE_REQUEST_KWARGS)
         
-        assert request.context_turns == 5
-        assert request.allowed_datasets == set()
-        assert request.metadata == {}
+        assert getattr(request, attr) == expected
 
 
 class TestAgentResponse:
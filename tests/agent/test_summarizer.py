@@ -10,7 +10,17 @@ from mcp_bigquery.agent.summarizer import (
 )
 
 
-@pytest.fixture
+# Synthetic datasets built once at import time.
+_LARGE_DATA = [{"id": i, "value": i * 10} for i in range(200)]
+_HIGH_CARD = [{"id": i, "name": f"name_{i}"} for i in range(100)]
+
+
+def _by_name(summary):
+    """Index a summary's column statistics by column name."""
+    return {c.name: c for c in summary.columns}
+
+
+@pytest.fixture(scope="session")
 def numeric_data():
     """Sample numeric dataset."""
     return [
@@ -24,7 +34,7 @@ def numeric_data():
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def categorical_data():
     """Sample categorical dataset."""
     return [
@@ -37,7 +47,7 @@ def categorical_data():
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mixed_data():
     """Sample mixed dataset with various types."""
     return [
@@ -68,12 +78,43 @@ def mixed_data():
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def empty_data():
     """Empty dataset."""
     return []
 
 
+@pytest.fixture(scope="session")
+def default_summarizer():
+    """Summarizer with default configuration, shared across tests."""
+    return ResultSummarizer()
+
+
+@pytest.fixture(scope="session")
+def numeric_summary(default_summarizer, numeric_data):
+    """Default-config summary of the numeric dataset."""
+    return default_summarizer.summarize(numeric_data)
+
+
+@pytest.fixture(scope="session")
+def categorical_summary(default_summarizer, categorical_data):
+    """Default-config summary of the categorical dataset."""
+    return default_summarizer.summarize(categorical_data)
+
+
+@pytest.fixture(scope="session")
+def mixed_summary(default_summarizer, mixed_data):
+    """Default-config summary of the mixed dataset."""
+    return default_summarizer.summarize(mixed_data)
+
+
+@pytest.fixture(scope="session")
+def large_sampled_summary():
+    """Summarizer with a small row cap and its summary of ``_LARGE_DATA``."""
+    summarizer = ResultSummarizer(max_rows=50)
+    return summarizer, summarizer.summarize(_LARGE_DATA)
+
+
 class TestResultSummarizer:
     """Tests for ResultSummarizer class."""
     
@@ -84,10 +125,9 @@ class TestResultSummarizer:
         assert summarizer.max_categories == 5
         assert summarizer.include_samples is True
         
-    def test_summarize_numeric_data(self, numeric_data):
+    def test_summarize_numeric_data(self, numeric_summary):
         """Test summarization of numeric data."""
-        summarizer = ResultSummarizer()
-        summary = summarizer.summarize(numeric_data)
+        summary = numeric_summary
         
         assert isinstance(summary, DataSummary)
         assert summary.total_rows == 7
@@ -96,7 +136,8 @@ class TestResultSummarizer:
         assert len(summary.columns) == 4
         
         # Check numeric columns
-        age_col = next(c for c in summary.columns if c.name == "age")
+        columns = _by_name(summary)
+        age_col = columns["age"]
         assert age_col.data_type == "numeric"
         assert age_col.count == 6  # One null value
         assert age_col.null_count == 1
@@ -106,52 +147,51 @@ class TestResultSummarizer:
         assert age_col.min is not None
         assert age_col.max is not None
         
-        salary_col = next(c for c in summary.columns if c.name == "salary")
+        salary_col = columns["salary"]
         assert salary_col.data_type == "numeric"
         assert salary_col.count == 6  # One null value
         
-    def test_summarize_categorical_data(self, categorical_data):
+    def test_summarize_categorical_data(self, categorical_summary):
         """Test summarization of categorical data."""
-        summarizer = ResultSummarizer()
-        summary = summarizer.summarize(categorical_data)
+        summary = categorical_summary
         
         assert summary.total_rows == 6
         assert summary.total_columns == 3
         
         # Check categorical columns
-        country_col = next(c for c in summary.columns if c.name == "country")
+        columns = _by_name(summary)
+        country_col = columns["country"]
         assert country_col.data_type == "categorical"
         assert country_col.unique_count is not None
         assert len(country_col.most_common) > 0
         assert country_col.most_common[0]["value"] == "USA"
         assert country_col.most_common[0]["count"] == 3
         
-        status_col = next(c for c in summary.columns if c.name == "status")
+        status_col = columns["status"]
         assert status_col.data_type == "categorical"
         
-    def test_summarize_mixed_data(self, mixed_data):
+    def test_summarize_mixed_data(self, mixed_summary):
         """Test summarization of mixed data types."""
-        summarizer = ResultSummarizer()
-        summary = summarizer.summarize(mixed_data)
+        summary = mixed_summary
         
         assert summary.total_rows == 4
         assert summary.total_columns == 4
         
         # Check different data types
-        value_col = next(c for c in summary.columns if c.name == "value")
+        columns = _by_name(summary)
+        value_col = columns["value"]
         assert value_col.data_type == "numeric"
         
-        category_col = next(c for c in summary.columns if c.name == "category")
+        category_col = columns["category"]
         assert category_col.data_type == "categorical"
         
-        is_valid_col = next(c for c in summary.columns if c.name == "is_valid")
+        is_valid_col = columns["is_valid"]
         # Boolean columns may be detected as boolean or numeric depending on pandas version
         assert is_valid_col.data_type in ("boolean", "numeric")
         
-    def test_summarize_empty_data(self, empty_data):
+    def test_summarize_empty_data(self, default_summarizer, empty_data):
         """Test summarization of empty dataset."""
-        summarizer = ResultSummarizer()
-        summary = summarizer.summarize(empty_data)
+        summary = default_summarizer.summarize(empty_data)
         
         assert summary.total_rows == 0
         assert summary.total_columns == 0
@@ -181,27 +221,23 @@ class TestResultSummarizer:
         
         assert len(limited) == len(numeric_data)
         
-    def test_sampling_large_dataset(self):
+    @pytest.mark.slow
+    def test_sampling_large_dataset(self, large_sampled_summary):
         """Test that large datasets are sampled."""
-        # Create a large dataset
-        large_data = [{"id": i, "value": i * 10} for i in range(200)]
-        
-        summarizer = ResultSummarizer(max_rows=50)
-        summary = summarizer.summarize(large_data)
+        _, summary = large_sampled_summary
         
         assert summary.total_rows == 200
         assert summary.sampled_rows == 50
         
-    def test_create_aggregate_summary_with_groupby(self, numeric_data):
+    def test_create_aggregate_summary_with_groupby(self, default_summarizer, numeric_data):
         """Test creating aggregate summary with groupby."""
-        summarizer = ResultSummarizer()
-        agg = summarizer.create_aggregate_summary(
+        agg = default_summarizer.create_aggregate_summary(
             numeric_data,
             group_by="department",
             numeric_cols=["salary"],
         )
         
-        assert len(agg) <= summarizer.max_categories
+        assert len(agg) <= default_summarizer.max_categories
         assert isinstance(agg, list)
         
     def test_create_aggregate_summary_without_groupby(self, numeric_data):
@@ -209,21 +245,20 @@ class TestResultSummarizer:
         summarizer = ResultSummarizer(max_rows=3)
         agg = summarizer.create_aggregate_summary(numeric_data)
         
+        # Rows are passed through by reference, so identity is sufficient
         assert len(agg) == 3
-        assert agg == numeric_data[:3]
+        assert agg[0] is numeric_data[0]
+        assert agg[-1] is numeric_data[2]
         
-    def test_create_aggregate_summary_empty(self, empty_data):
+    def test_create_aggregate_summary_empty(self, default_summarizer, empty_data):
         """Test aggregate summary with empty data."""
-        summarizer = ResultSummarizer()
-        agg = summarizer.create_aggregate_summary(empty_data)
+        agg = default_summarizer.create_aggregate_summary(empty_data)
         
         assert len(agg) == 0
         
-    def test_format_summary_text(self, numeric_data):
+    def test_format_summary_text(self, default_summarizer, numeric_summary):
         """Test formatting summary as text."""
-        summarizer = ResultSummarizer()
-        summary = summarizer.summarize(numeric_data)
-        text = summarizer.format_summary_text(summary)
+        text = default_summarizer.format_summary_text(numeric_summary)
         
         assert "Query Result Summary" in text
         assert "Total Rows:" in text
@@ -231,25 +266,24 @@ class TestResultSummarizer:
         assert "Key Insights" in text
         assert "Column Statistics" in text
         
-    def test_format_summary_text_with_sampling(self):
+    @pytest.mark.slow
+    def test_format_summary_text_with_sampling(self, large_sampled_summary):
         """Test format with sampling indication."""
-        large_data = [{"id": i, "value": i * 10} for i in range(200)]
-        summarizer = ResultSummarizer(max_rows=50)
-        summary = summarizer.summarize(large_data)
+        summarizer, summary = large_sampled_summary
         text = summarizer.format_summary_text(summary)
         
         assert "Sampled Rows:" in text
         
-    def test_key_insights_generation(self, numeric_data):
+    def test_key_insights_generation(self, numeric_summary):
         """Test that key insights are generated."""
-        summarizer = ResultSummarizer()
-        summary = summarizer.summarize(numeric_data)
+        summary = numeric_summary
         
         assert len(summary.key_insights) > 0
-        assert any("rows" in insight.lower() for insight in summary.key_insights)
-        assert any("column" in insight.lower() for insight in summary.key_insights)
+        joined = "\n".join(summary.key_insights).lower()
+        assert "rows" in joined
+        assert "column" in joined
         
-    def test_key_insights_null_values(self, numeric_data):
+    def test_key_insights_null_values(self, default_summarizer, numeric_data):
         """Test insights about null values."""
         # Create data with high null percentage
         data_with_nulls = [
@@ -258,39 +292,27 @@ class TestResultSummarizer:
             {"id": 3, "value": 300, "optional": "data"},
         ]
         
-        summarizer = ResultSummarizer()
-        summary = summarizer.summarize(data_with_nulls)
+        summary = default_summarizer.summarize(data_with_nulls)
         
         # Should mention high null values
-        null_insights = [i for i in summary.key_insights if "null" in i.lower()]
-        assert len(null_insights) > 0
+        joined = "\n".join(summary.key_insights).lower()
+        assert "null" in joined
         
-    def test_visualization_suggestions_numeric(self, numeric_data):
-        """Test visualization suggestions for numeric data."""
-        summarizer = ResultSummarizer()
-        summary = summarizer.summarize(numeric_data)
+    @pytest.mark.parametrize(
+        "summary_fixture", ["numeric_summary", "categorical_summary", "mixed_summary"]
+    )
+    def test_visualization_suggestions(self, request, summary_fixture):
+        """Test visualization suggestions are produced for each data shape."""
+        summary = request.getfixturevalue(summary_fixture)
         
-        assert len(summary.visualization_suggestions) > 0
+        assert summary.visualization_suggestions
         
-        # Should suggest appropriate charts for numeric data
-        chart_types = [viz["type"] for viz in summary.visualization_suggestions]
+    def test_visualization_suggestions_numeric_chart_types(self, numeric_summary):
+        """Test numeric data gets appropriate chart suggestions."""
+        chart_types = [viz["type"] for viz in numeric_summary.visualization_suggestions]
         assert any(t in ["bar", "scatter", "histogram"] for t in chart_types)
         
-    def test_visualization_suggestions_categorical(self, categorical_data):
-        """Test visualization suggestions for categorical data."""
-        summarizer = ResultSummarizer()
-        summary = summarizer.summarize(categorical_data)
-        
-        assert len(summary.visualization_suggestions) > 0
-        
-    def test_visualization_suggestions_mixed(self, mixed_data):
-        """Test visualization suggestions for mixed data."""
-        summarizer = ResultSummarizer()
-        summary = summarizer.summarize(mixed_data)
-        
-        assert len(summary.visualization_suggestions) > 0
-        
-    def test_column_statistics_null_percentage(self):
+    def test_column_statistics_null_percentage(self, default_summarizer):
         """Test null percentage calculation."""
         data = [
             {"value": 1},
@@ -299,31 +321,29 @@ class TestResultSummarizer:
             {"value": None},
         ]
         
-        summarizer = ResultSummarizer()
-        summary = summarizer.summarize(data)
+        summary = default_summarizer.summarize(data)
         
         value_col = summary.columns[0]
         assert value_col.null_percentage == 50.0
         assert value_col.null_count == 2
         assert value_col.count == 2
         
-    def test_column_statistics_unique_count(self, categorical_data):
+    def test_column_statistics_unique_count(self, categorical_summary):
         """Test unique count calculation."""
-        summarizer = ResultSummarizer()
-        summary = summarizer.summarize(categorical_data)
+        summary = categorical_summary
         
-        country_col = next(c for c in summary.columns if c.name == "country")
+        columns = _by_name(summary)
+        country_col = columns["country"]
         assert country_col.unique_count == 3  # USA, UK, Canada
         
-        city_col = next(c for c in summary.columns if c.name == "city")
+        city_col = columns["city"]
         assert city_col.unique_count == 6  # New York, San Francisco, London, Manchester, Boston, Toronto
         
-    def test_column_statistics_percentiles(self, numeric_data):
+    def test_column_statistics_percentiles(self, numeric_summary):
         """Test percentile calculation for numeric columns."""
-        summarizer = ResultSummarizer()
-        summary = summarizer.summarize(numeric_data)
+        summary = numeric_summary
         
-        age_col = next(c for c in summary.columns if c.name == "age")
+        age_col = _by_name(summary)["age"]
         assert age_col.percentile_25 is not None
         assert age_col.percentile_75 is not None
         assert age_col.percentile_25 < age_col.percentile_75
@@ -333,7 +353,7 @@ class TestResultSummarizer:
         summarizer = ResultSummarizer(max_categories=2)
         summary = summarizer.summarize(categorical_data)
         
-        country_col = next(c for c in summary.columns if c.name == "country")
+        country_col = _by_name(summary)["country"]
         assert len(country_col.most_common) <= 2
         assert country_col.most_common[0]["value"] == "USA"
         assert country_col.most_common[0]["count"] == 3
@@ -343,7 +363,7 @@ class TestResultSummarizer:
         summarizer = ResultSummarizer(include_samples=True)
         summary = summarizer.summarize(categorical_data)
         
-        city_col = next(c for c in summary.columns if c.name == "city")
+        city_col = _by_name(summary)["city"]
         assert len(city_col.sample_values) > 0
         assert all(isinstance(v, str) for v in city_col.sample_values)
         
@@ -352,31 +372,27 @@ class TestResultSummarizer:
         summarizer = ResultSummarizer(include_samples=False)
         summary = summarizer.summarize(categorical_data)
         
-        city_col = next(c for c in summary.columns if c.name == "city")
+        city_col = _by_name(summary)["city"]
         assert len(city_col.sample_values) == 0
         
-    def test_high_cardinality_insight(self):
+    @pytest.mark.slow
+    def test_high_cardinality_insight(self, default_summarizer):
         """Test insight for high cardinality columns."""
-        # Create data with high cardinality
-        data = [{"id": i, "name": f"name_{i}"} for i in range(100)]
-        
-        summarizer = ResultSummarizer()
-        summary = summarizer.summarize(data)
+        summary = default_summarizer.summarize(_HIGH_CARD)
         
         # Should detect high cardinality
-        high_card_insights = [i for i in summary.key_insights if "high-cardinality" in i.lower()]
-        assert len(high_card_insights) > 0
+        joined = "\n".join(summary.key_insights).lower()
+        assert "high-cardinality" in joined
         
-    def test_data_type_distribution_insight(self, numeric_data):
+    def test_data_type_distribution_insight(self, numeric_summary):
         """Test insight about data type distribution."""
-        summarizer = ResultSummarizer()
-        summary = summarizer.summarize(numeric_data)
+        summary = numeric_summary
         
         # Should mention column types
-        type_insights = [i for i in summary.key_insights if "Column types:" in i]
-        assert len(type_insights) > 0
+        joined = "\n".join(summary.key_insights)
+        assert "Column types:" in joined
         
-    def test_numeric_variability_insight(self):
+    def test_numeric_variability_insight(self, default_summarizer):
         """Test insight about high variability in numeric columns."""
         # Create data with high variability
         data = [
@@ -387,17 +403,15 @@ class TestResultSummarizer:
             {"value": 10},
         ]
         
-        summarizer = ResultSummarizer()
-        summary = summarizer.summarize(data)
+        summary = default_summarizer.summarize(data)
         
         # Should detect high variability
-        var_insights = [i for i in summary.key_insights if "variability" in i.lower()]
-        assert len(var_insights) > 0
+        joined = "\n".join(summary.key_insights).lower()
+        assert "variability" in joined
         
-    def test_aggregate_by_categorical_only(self, categorical_data):
+    def test_aggregate_by_categorical_only(self, default_summarizer, categorical_data):
         """Test aggregation when no numeric columns present."""
-        summarizer = ResultSummarizer()
-        agg = summarizer.create_aggregate_summary(
+        agg = default_summarizer.create_aggregate_summary(
             categorical_data,
             group_by="country",
         )
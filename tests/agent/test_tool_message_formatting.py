@@ -8,12 +8,13 @@ with the required OpenAI message structure:
 """
 
 import pytest
-from unittest.mock import AsyncMock, Mock
-import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
 
 from src.mcp_bigquery.agent.conversation import InsightsAgent
 from src.mcp_bigquery.agent.models import AgentRequest
 from src.mcp_bigquery.agent.mcp_client import DatasetInfo
+from src.mcp_bigquery.llm.providers.openai_provider import _to_openai_messages
 from src.mcp_bigquery.llm.providers.base import (
     Message,
     GenerationResponse,
@@ -21,11 +22,39 @@ from src.mcp_bigquery.llm.providers.base import (
 )
 
 
+_TC_LIST_DS = ToolCall(id="call_123", name="list_datasets", arguments={})
+_RESP_TOOL_LIST_DS = GenerationResponse(
+    content=None,
+    tool_calls=[_TC_LIST_DS],
+    finish_reason="tool_calls"
+)
+_RESP_FINAL_DS = GenerationResponse(
+    content="You have access to 2 datasets: Analytics and Sales.",
+    tool_calls=[],
+    finish_reason="stop"
+)
+
+_BASE_REQ = AgentRequest(
+    question="placeholder",  # every test overrides the question
+    session_id="test_session",
+    user_id="test_user",
+    allowed_datasets={"*"},
+    allowed_tables={}
+)
+
+
+def _const_async(val):
+    """Build a plain async stub that always returns ``val``."""
+    async def f(*args, **kwargs):
+        return val
+    return f
+
+
 @pytest.fixture
 def mock_mcp_client():
     """Create a mock MCP client."""
     client = AsyncMock()
-    client.list_datasets = AsyncMock(return_value=[
+    client.list_datasets = _const_async([
         DatasetInfo(dataset_id="Analytics", project_id="test-project"),
         DatasetInfo(dataset_id="Sales", project_id="test-project"),
     ])
@@ -36,47 +65,39 @@ def mock_mcp_client():
 def mock_kb():
     """Create a mock knowledge base."""
     kb = AsyncMock()
-    kb.get_chat_messages = AsyncMock(return_value=[])
-    kb.append_chat_message = AsyncMock()
+    kb.get_chat_messages = _const_async([])
+    kb.append_chat_message = _const_async(None)
     return kb
 
 
 class TestToolMessageFormatting:
     """Tests for tool message formatting."""
     
-    @pytest.mark.asyncio
+    @pytest.mark.slow
     async def test_assistant_message_includes_tool_calls(self, mock_mcp_client, mock_kb):
         """Test that assistant message with tool_calls is properly added before tool results."""
         
         # Track the messages sent to LLM
         messages_sent = []
         
-        def capture_messages(messages, **kwargs):
+        async def capture_messages(messages, **kwargs):
             """Capture messages sent to LLM."""
-            messages_sent.append([msg for msg in messages])
+            # The agent appends to the same list between calls, so snapshot it
+            messages_sent.append(messages.copy())
             
             # First call: LLM requests tool call
             if len(messages_sent) == 1:
-                return GenerationResponse(
-                    content=None,
-                    tool_calls=[
-                        ToolCall(id="call_123", name="list_datasets", arguments={})
-                    ],
-                    finish_reason="tool_calls"
-                )
+                return _RESP_TOOL_LIST_DS
             # Second call: LLM provides final answer
             else:
-                return GenerationResponse(
-                    content="You have access to 2 datasets: Analytics and Sales.",
-                    tool_calls=[],
-                    finish_reason="stop"
-                )
+                return _RESP_FINAL_DS
         
-        mock_llm = Mock()
-        mock_llm.provider_name = "openai"
-        mock_llm.config = Mock(model="gpt-4o")
-        mock_llm.supports_functions = Mock(return_value=True)
-        mock_llm.generate = AsyncMock(side_effect=capture_messages)
+        mock_llm = SimpleNamespace(
+            provider_name="openai",
+            config=SimpleNamespace(model="gpt-4o"),
+            supports_functions=lambda: True,
+            generate=capture_messages,
+        )
         
         agent = InsightsAgent(
             llm_provider=mock_llm,
@@ -86,13 +107,7 @@ class TestToolMessageFormatting:
             enable_tool_selection=True
         )
         
-        request = AgentRequest(
-            question="what datasets do we have?",
-            session_id="test_session",
-            user_id="test_user",
-            allowed_datasets={"*"},
-            allowed_tables={}
-        )
+        request = _BASE_REQ.model_copy(update={"question": "what datasets do we have?"})
         
         response = await agent.process_question(request)
         
@@ -111,14 +126,19 @@ class TestToolMessageFormatting:
         # Check second call (final response) - THIS IS THE CRITICAL FIX
         second_call_messages = messages_sent[1]
         
-        # Find assistant message with tool_calls
+        # Find assistant message with tool_calls, recording positions as we go
         assistant_with_tools = None
+        assistant_idx = None
         tool_messages = []
+        tool_idx = None
         
-        for msg in second_call_messages:
+        for i, msg in enumerate(second_call_messages):
             if msg.role == "assistant" and msg.tool_calls:
                 assistant_with_tools = msg
+                assistant_idx = i
             elif msg.role == "tool":
+                if tool_idx is None:
+                    tool_idx = i
                 tool_messages.append(msg)
         
         # CRITICAL ASSERTIONS - These would fail before the fix
@@ -133,11 +153,9 @@ class TestToolMessageFormatting:
         assert tool_messages[0].content is not None, "Tool message must have content"
         
         # Verify message order: assistant with tool_calls comes BEFORE tool results
-        assistant_idx = second_call_messages.index(assistant_with_tools)
-        tool_idx = second_call_messages.index(tool_messages[0])
         assert assistant_idx < tool_idx, "Assistant message must come before tool result"
     
-    @pytest.mark.asyncio
+    @pytest.mark.slow
     async def test_message_format_matches_openai_requirements(self, mock_mcp_client, mock_kb):
         """Test that message format exactly matches OpenAI API requirements."""
         
@@ -146,56 +164,30 @@ class TestToolMessageFormatting:
         
         async def mock_openai_generate(messages, **kwargs):
             """Mock OpenAI generate that validates message format."""
-            # Convert Message objects to OpenAI format (as the provider does)
-            openai_msgs = []
-            for msg in messages:
-                openai_msg = {
-                    "role": msg.role,
-                    "content": msg.content
-                }
-                
-                if msg.role == "assistant" and msg.tool_calls:
-                    openai_msg["tool_calls"] = [
-                        {
-                            "id": tc.id,
-                            "type": "function",
-                            "function": {
-                                "name": tc.name,
-                                "arguments": json.dumps(tc.arguments)
-                            }
-                        }
-                        for tc in msg.tool_calls
-                    ]
-                
-                if msg.role == "tool" and msg.tool_call_id:
-                    openai_msg["tool_call_id"] = msg.tool_call_id
-                
-                openai_msgs.append(openai_msg)
+            # Convert Message objects with the provider's own converter
+            openai_msgs = _to_openai_messages(messages)
             
             openai_messages_sent.append(openai_msgs)
             
             # Validate OpenAI requirements for tool messages
             if len(openai_messages_sent) > 1:
-                # Second call should have proper tool message format
-                for i, msg in enumerate(openai_msgs):
-                    if msg["role"] == "tool":
-                        # Find the preceding assistant message
-                        found_tool_calls = False
-                        for j in range(i - 1, -1, -1):
-                            if openai_msgs[j]["role"] == "assistant" and "tool_calls" in openai_msgs[j]:
-                                found_tool_calls = True
-                                break
+                # Second call should have proper tool message format.
+                # Single forward pass: tool ids seen on preceding assistant messages.
+                assistant_tool_call_ids = set()
+                for msg in openai_msgs:
+                    if msg["role"] == "assistant" and "tool_calls" in msg:
+                        assistant_tool_call_ids.update(tc["id"] for tc in msg["tool_calls"])
+                    elif msg["role"] == "tool":
+                        # Tool message must have tool_call_id
+                        if "tool_call_id" not in msg:
+                            raise ValueError("Tool message must have tool_call_id")
                         
                         # This is the OpenAI requirement that was failing
-                        if not found_tool_calls:
+                        if msg["tool_call_id"] not in assistant_tool_call_ids:
                             raise ValueError(
                                 "Invalid parameter: messages with role 'tool' must be a "
                                 "response to a preceeding message with 'tool_calls'."
                             )
-                        
-                        # Tool message must have tool_call_id
-                        if "tool_call_id" not in msg:
-                            raise ValueError("Tool message must have tool_call_id")
             
             # Return mock responses
             if len(openai_messages_sent) == 1:
@@ -211,11 +203,12 @@ class TestToolMessageFormatting:
                     finish_reason="stop"
                 )
         
-        mock_llm = Mock()
-        mock_llm.provider_name = "openai"
-        mock_llm.config = Mock(model="gpt-4o")
-        mock_llm.supports_functions = Mock(return_value=True)
-        mock_llm.generate = AsyncMock(side_effect=mock_openai_generate)
+        mock_llm = SimpleNamespace(
+            provider_name="openai",
+            config=SimpleNamespace(model="gpt-4o"),
+            supports_functions=lambda: True,
+            generate=mock_openai_generate,
+        )
         
         agent = InsightsAgent(
             llm_provider=mock_llm,
@@ -225,13 +218,7 @@ class TestToolMessageFormatting:
             enable_tool_selection=True
         )
         
-        request = AgentRequest(
-            question="show datasets",
-            session_id="test_session",
-            user_id="test_user",
-            allowed_datasets={"*"},
-            allowed_tables={}
-        )
+        request = _BASE_REQ.model_copy(update={"question": "show datasets"})
         
         # This should NOT raise the OpenAI validation error
         response = await agent.process_question(request)
@@ -1,14 +1,17 @@
 """Tests for LLM-based tool selection functionality."""
 
+import asyncio
 import pytest
-from unittest.mock import AsyncMock, Mock, MagicMock
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
 import json
+import re
 
 from src.mcp_bigquery.agent.tools import Tool, ToolRegistry
 from src.mcp_bigquery.agent.tool_executor import ToolExecutor
 from src.mcp_bigquery.agent.conversation import InsightsAgent
 from src.mcp_bigquery.agent.models import AgentRequest
-from src.mcp_bigquery.agent.mcp_client import DatasetInfo, TableInfo, TableSchema
+from src.mcp_bigquery.agent.mcp_client import DatasetInfo, TableInfo, TableSchema, QueryResult
 from src.mcp_bigquery.llm.providers.base import (
     Message,
     GenerationResponse,
@@ -17,55 +20,143 @@ from src.mcp_bigquery.llm.providers.base import (
 )
 
 
-@pytest.fixture
+_DATASETS = [
+    DatasetInfo(dataset_id="Analytics", project_id="test-project"),
+    DatasetInfo(dataset_id="Sales", project_id="test-project"),
+]
+_TABLES = [
+    TableInfo(table_id="users", dataset_id="Analytics"),
+    TableInfo(table_id="events", dataset_id="Analytics"),
+]
+_SCHEMA = TableSchema(
+    table_id="users",
+    dataset_id="Analytics",
+    schema_fields=[
+        {"name": "id", "type": "INTEGER"},
+        {"name": "name", "type": "STRING"},
+    ]
+)
+_QUERY_RESULT = QueryResult(
+    rows=[{"id": 1, "name": "Alice"}],
+    statistics={"totalBytesProcessed": 1000}
+)
+
+_UNSUPPORTED_RE = re.compile("Unsupported provider")
+
+_TC_LIST_DS = ToolCall(id="call_1", name="list_datasets", arguments={})
+_RESP_TOOL_LIST_DS = GenerationResponse(
+    content=None,
+    tool_calls=[_TC_LIST_DS],
+    finish_reason="tool_calls"
+)
+_RESP_FINAL_DS = GenerationResponse(
+    content="You have access to 2 datasets: Analytics and Sales.",
+    tool_calls=[],
+    finish_reason="stop"
+)
+
+_BASE_REQ = AgentRequest(
+    question="placeholder",  # every test overrides the question
+    session_id="test_session",
+    user_id="test_user",
+    allowed_datasets={"*"},
+    allowed_tables={}
+)
+
+
+def _const_async(val):
+    """Build a plain async stub that always returns ``val``."""
+    async def f(*args, **kwargs):
+        return val
+    return f
+
+
+def make_llm(responses):
+    """Build an async ``generate`` stub returning ``responses`` in order."""
+    it = iter(responses)
+    
+    async def gen(messages, **kwargs):
+        return next(it)
+    
+    return gen
+
+
+@pytest.fixture(scope="module")
 def mock_mcp_client():
     """Create a mock MCP client."""
     client = AsyncMock()
     
-    # Mock list_datasets
-    client.list_datasets = AsyncMock(return_value=[
-        DatasetInfo(dataset_id="Analytics", project_id="test-project"),
-        DatasetInfo(dataset_id="Sales", project_id="test-project"),
-    ])
-    
-    # Mock list_tables
-    client.list_tables = AsyncMock(return_value=[
-        TableInfo(table_id="users", dataset_id="Analytics"),
-        TableInfo(table_id="events", dataset_id="Analytics"),
-    ])
-    
-    # Mock get_table_schema
-    client.get_table_schema = AsyncMock(return_value=TableSchema(
-        table_id="users",
-        dataset_id="Analytics",
-        schema_fields=[
-            {"name": "id", "type": "INTEGER"},
-            {"name": "name", "type": "STRING"},
-        ]
-    ))
-    
-    # Mock execute_sql - return a proper QueryResult-like object
-    from src.mcp_bigquery.agent.mcp_client import QueryResult
-    client.execute_sql = AsyncMock(return_value=QueryResult(
-        rows=[{"id": 1, "name": "Alice"}],
-        statistics={"totalBytesProcessed": 1000}
-    ))
+    # Calls are asserted below, so keep AsyncMock; spec= avoids child mocks
+    client.list_datasets = AsyncMock(spec=lambda: None, return_value=_DATASETS)
+    client.list_tables = AsyncMock(spec=lambda dataset_id: None, return_value=_TABLES)
+    client.get_table_schema = AsyncMock(
+        spec=lambda dataset_id, table_id, include_samples=True: None,
+        return_value=_SCHEMA,
+    )
+    client.execute_sql = AsyncMock(
+        spec=lambda sql, maximum_bytes_billed=None, use_cache=True: None,
+        return_value=_QUERY_RESULT,
+    )
     
     return client
 
 
-@pytest.fixture
+@pytest.fixture(autouse=True)
+def reset_mcp_client(mock_mcp_client):
+    """Clear recorded calls on the shared MCP client between tests."""
+    yield
+    mock_mcp_client.reset_mock()
+
+
+@pytest.fixture(scope="module")
 def tool_registry(mock_mcp_client):
     """Create a tool registry."""
     return ToolRegistry(mock_mcp_client)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def tool_executor(tool_registry):
     """Create a tool executor."""
     return ToolExecutor(tool_registry)
 
 
+@pytest.fixture(scope="module")
+def mock_llm_provider():
+    """Create a mock LLM provider."""
+    return SimpleNamespace(
+        provider_name="openai",
+        config=SimpleNamespace(model="gpt-4o"),
+        supports_functions=lambda: True,
+        generate=None,  # rebound by each test
+    )
+
+
+@pytest.fixture(scope="module")
+def mock_kb():
+    """Create a mock knowledge base."""
+    kb = AsyncMock()
+    kb.get_chat_messages = _const_async([])
+    kb.append_chat_message = _const_async(None)
+    return kb
+
+
+@pytest.fixture(scope="class")
+def agent(mock_llm_provider, mock_mcp_client, mock_kb):
+    """Create an InsightsAgent with tool selection enabled.
+    
+    The agent holds no per-question state, so one instance is shared by
+    the class; each test rebinds ``mock_llm_provider.generate``.
+    """
+    agent = InsightsAgent(
+        llm_provider=mock_llm_provider,
+        mcp_client=mock_mcp_client,
+        kb=mock_kb,
+        project_id="test-project",
+        enable_tool_selection=True
+    )
+    return agent
+
+
 class TestToolRegistry:
     """Tests for ToolRegistry."""
     
@@ -111,16 +202,21 @@ class TestToolRegistry:
         assert len(tools) == 4
         assert all(isinstance(t, ToolDefinition) for t in tools)
     
+    def test_get_tools_for_llm_cached_per_provider(self, tool_registry):
+        """Test that tool definitions are built once per provider."""
+        openai_tools = tool_registry.get_tools_for_llm("openai")
+        assert tool_registry.get_tools_for_llm("openai") is openai_tools
+        assert tool_registry.get_tools_for_llm("anthropic") is not openai_tools
+    
     def test_unsupported_provider(self, tool_registry):
         """Test that unsupported provider raises error."""
-        with pytest.raises(ValueError, match="Unsupported provider"):
+        with pytest.raises(ValueError, match=_UNSUPPORTED_RE):
             tool_registry.get_tools_for_llm("unsupported")
 
 
 class TestToolExecutor:
     """Tests for ToolExecutor."""
     
-    @pytest.mark.asyncio
     async def test_execute_list_datasets(self, tool_executor, mock_mcp_client):
         """Test executing list_datasets tool."""
         tool_call = ToolCall(
@@ -137,7 +233,6 @@ class TestToolExecutor:
         assert len(result["result"]) == 2
         mock_mcp_client.list_datasets.assert_called_once()
     
-    @pytest.mark.asyncio
     async def test_execute_list_tables(self, tool_executor, mock_mcp_client):
         """Test executing list_tables tool."""
         tool_call = ToolCall(
@@ -153,7 +248,6 @@ class TestToolExecutor:
         assert len(result["result"]) == 2
         mock_mcp_client.list_tables.assert_called_once_with(dataset_id="Analytics")
     
-    @pytest.mark.asyncio
     async def test_execute_get_table_schema(self, tool_executor, mock_mcp_client):
         """Test executing get_table_schema tool."""
         tool_call = ToolCall(
@@ -174,7 +268,6 @@ class TestToolExecutor:
             table_id="users"
         )
     
-    @pytest.mark.asyncio
     async def test_execute_sql(self, tool_executor, mock_mcp_client):
         """Test executing execute_sql tool."""
         tool_call = ToolCall(
@@ -191,7 +284,6 @@ class TestToolExecutor:
             sql="SELECT * FROM users LIMIT 10"
         )
     
-    @pytest.mark.asyncio
     async def test_execute_unknown_tool(self, tool_executor):
         """Test executing unknown tool returns error."""
         tool_call = ToolCall(
@@ -205,11 +297,10 @@ class TestToolExecutor:
         assert result["success"] is False
         assert "Unknown tool" in result["error"]
     
-    @pytest.mark.asyncio
     async def test_execute_multiple_tools(self, tool_executor, mock_mcp_client):
         """Test executing multiple tool calls."""
         tool_calls = [
-            ToolCall(id="call_1", name="list_datasets", arguments={}),
+            _TC_LIST_DS,
             ToolCall(id="call_2", name="list_tables", arguments={"dataset_id": "Analytics"}),
         ]
         
@@ -220,38 +311,39 @@ class TestToolExecutor:
         assert results[0]["tool_name"] == "list_datasets"
         assert results[1]["tool_name"] == "list_tables"
 
+    async def test_execute_multiple_tools_concurrently(self, tool_registry, tool_executor, monkeypatch):
+        """Test independent tool calls run concurrently, not one after another."""
+        tables_started = asyncio.Event()
+
+        async def list_datasets():
+            # Only completes if list_tables was started while this call is pending
+            await asyncio.wait_for(tables_started.wait(), timeout=1)
+            return []
+
+        async def list_tables(dataset_id):
+            tables_started.set()
+            return []
+
+        monkeypatch.setattr(tool_registry.get_tool_by_name("list_datasets"), "handler", list_datasets)
+        monkeypatch.setattr(tool_registry.get_tool_by_name("list_tables"), "handler", list_tables)
+
+        results = await tool_executor.execute_tool_calls([
+            _TC_LIST_DS,
+            ToolCall(id="call_2", name="list_tables", arguments={"dataset_id": "Analytics"}),
+        ])
+
+        assert [r["success"] for r in results] == [True, True]
+        assert [r["tool_call_id"] for r in results] == ["call_1", "call_2"]
+
 
 class TestInsightsAgentWithToolSelection:
     """Tests for InsightsAgent with tool selection."""
     
-    @pytest.fixture
-    def mock_llm_provider(self):
-        """Create a mock LLM provider."""
-        provider = Mock()
-        provider.provider_name = "openai"
-        provider.config = Mock(model="gpt-4o")
-        provider.supports_functions = Mock(return_value=True)
-        return provider
-    
-    @pytest.fixture
-    def mock_kb(self):
-        """Create a mock knowledge base."""
-        kb = AsyncMock()
-        kb.get_chat_messages = AsyncMock(return_value=[])
-        kb.append_chat_message = AsyncMock()
-        return kb
-    
-    @pytest.fixture
-    def agent(self, mock_llm_provider, mock_mcp_client, mock_kb):
-        """Create an InsightsAgent with tool selection enabled."""
-        agent = InsightsAgent(
-            llm_provider=mock_llm_provider,
-            mcp_client=mock_mcp_client,
-            kb=mock_kb,
-            project_id="test-project",
-            enable_tool_selection=True
-        )
-        return agent
+    @pytest.fixture(autouse=True)
+    def reset_kb(self, mock_kb):
+        """Clear recorded calls on the shared knowledge base between tests."""
+        yield
+        mock_kb.reset_mock()
     
     def test_agent_initialization_with_tool_selection(self, agent):
         """Test that agent initializes with tool selection."""
@@ -259,39 +351,13 @@ class TestInsightsAgentWithToolSelection:
         assert agent.tool_registry is not None
         assert agent.tool_executor is not None
     
-    @pytest.mark.asyncio
+    @pytest.mark.slow
     async def test_list_datasets_question(self, agent, mock_llm_provider, mock_mcp_client):
         """Test that 'what datasets' questions call list_datasets tool."""
-        # Mock LLM to return tool call
-        mock_llm_provider.generate = AsyncMock(return_value=GenerationResponse(
-            content=None,
-            tool_calls=[
-                ToolCall(id="call_1", name="list_datasets", arguments={})
-            ],
-            finish_reason="tool_calls"
-        ))
+        # First call selects the tool, second call returns final answer
+        mock_llm_provider.generate = make_llm([_RESP_TOOL_LIST_DS, _RESP_FINAL_DS])
         
-        # Second call returns final answer
-        mock_llm_provider.generate.side_effect = [
-            GenerationResponse(
-                content=None,
-                tool_calls=[ToolCall(id="call_1", name="list_datasets", arguments={})],
-                finish_reason="tool_calls"
-            ),
-            GenerationResponse(
-                content="You have access to 2 datasets: Analytics and Sales.",
-                tool_calls=[],
-                finish_reason="stop"
-            )
-        ]
-        
-        request = AgentRequest(
-            question="what datasets do I have?",
-            session_id="test_session",
-            user_id="test_user",
-            allowed_datasets={"*"},
-            allowed_tables={}
-        )
+        request = _BASE_REQ.model_copy(update={"question": "what datasets do I have?"})
         
         response = await agent.process_question(request)
         
@@ -299,11 +365,10 @@ class TestInsightsAgentWithToolSelection:
         assert "datasets" in response.answer.lower() or "Analytics" in response.answer
         mock_mcp_client.list_datasets.assert_called_once()
     
-    @pytest.mark.asyncio
+    @pytest.mark.slow
     async def test_list_tables_question(self, agent, mock_llm_provider, mock_mcp_client):
         """Test that 'show tables' questions call list_tables tool."""
-        mock_llm_provider.generate = AsyncMock()
-        mock_llm_provider.generate.side_effect = [
+        mock_llm_provider.generate = make_llm([
             GenerationResponse(
                 content=None,
                 tool_calls=[
@@ -316,26 +381,23 @@ class TestInsightsAgentWithToolSelection:
                 tool_calls=[],
                 finish_reason="stop"
             )
-        ]
+        ])
         
-        request = AgentRequest(
-            question="show tables in Analytics",
-            session_id="test_session",
-            user_id="test_user",
-            allowed_datasets={"Analytics"},
-            allowed_tables={"Analytics": {"*"}}
-        )
+        request = _BASE_REQ.model_copy(update={
+            "question": "show tables in Analytics",
+            "allowed_datasets": {"Analytics"},
+            "allowed_tables": {"Analytics": {"*"}},
+        })
         
         response = await agent.process_question(request)
         
         assert response.success is True
         mock_mcp_client.list_tables.assert_called_once_with(dataset_id="Analytics")
     
-    @pytest.mark.asyncio
+    @pytest.mark.slow
     async def test_get_schema_question(self, agent, mock_llm_provider, mock_mcp_client):
         """Test that 'describe table' questions call get_table_schema tool."""
-        mock_llm_provider.generate = AsyncMock()
-        mock_llm_provider.generate.side_effect = [
+        mock_llm_provider.generate = make_llm([
             GenerationResponse(
                 content=None,
                 tool_calls=[
@@ -352,26 +414,23 @@ class TestInsightsAgentWithToolSelection:
                 tool_calls=[],
                 finish_reason="stop"
             )
-        ]
+        ])
         
-        request = AgentRequest(
-            question="describe the users table",
-            session_id="test_session",
-            user_id="test_user",
-            allowed_datasets={"Analytics"},
-            allowed_tables={"Analytics": {"users"}}
-        )
+        request = _BASE_REQ.model_copy(update={
+            "question": "describe the users table",
+            "allowed_datasets": {"Analytics"},
+            "allowed_tables": {"Analytics": {"users"}},
+        })
         
         response = await agent.process_question(request)
         
         assert response.success is True
         mock_mcp_client.get_table_schema.assert_called_once()
     
-    @pytest.mark.asyncio
+    @pytest.mark.slow
     async def test_execute_sql_question(self, agent, mock_llm_provider, mock_mcp_client):
         """Test that data questions call execute_sql tool."""
-        mock_llm_provider.generate = AsyncMock()
-        mock_llm_provider.generate.side_effect = [
+        mock_llm_provider.generate = make_llm([
             GenerationResponse(
                 content=None,
                 tool_calls=[
@@ -388,37 +447,28 @@ class TestInsightsAgentWithToolSelection:
                 tool_calls=[],
                 finish_reason="stop"
             )
-        ]
+        ])
         
-        request = AgentRequest(
-            question="show me data from users table",
-            session_id="test_session",
-            user_id="test_user",
-            allowed_datasets={"Analytics"},
-            allowed_tables={"Analytics": {"users"}}
-        )
+        request = _BASE_REQ.model_copy(update={
+            "question": "show me data from users table",
+            "allowed_datasets": {"Analytics"},
+            "allowed_tables": {"Analytics": {"users"}},
+        })
         
         response = await agent.process_question(request)
         
         assert response.success is True
         mock_mcp_client.execute_sql.assert_called_once()
     
-    @pytest.mark.asyncio
     async def test_no_tool_calls(self, agent, mock_llm_provider):
         """Test LLM providing direct answer without tool calls."""
-        mock_llm_provider.generate = AsyncMock(return_value=GenerationResponse(
+        mock_llm_provider.generate = make_llm([GenerationResponse(
             content="I can help you explore your BigQuery data. What would you like to know?",
             tool_calls=[],
             finish_reason="stop"
-        ))
+        )])
         
-        request = AgentRequest(
-            question="hello",
-            session_id="test_session",
-            user_id="test_user",
-            allowed_datasets={"*"},
-            allowed_tables={}
-        )
+        request = _BASE_REQ.model_copy(update={"question": "hello"})
         
         response = await agent.process_question(request)
         
@@ -429,38 +479,15 @@ class TestInsightsAgentWithToolSelection:
 class TestToolSelectionIntegration:
     """Integration tests for tool selection."""
     
-    @pytest.mark.asyncio
-    async def test_tool_selection_with_openai_format(self, mock_mcp_client):
-        """Test tool selection works with OpenAI format."""
-        registry = ToolRegistry(mock_mcp_client)
-        executor = ToolExecutor(registry)
-        
-        # Simulate OpenAI tool call
-        tool_call = ToolCall(
-            id="call_abc123",
-            name="list_datasets",
-            arguments={}
-        )
-        
-        result = await executor.execute_single_tool(tool_call)
-        
-        assert result["success"] is True
-        assert len(result["result"]) == 2
-    
-    @pytest.mark.asyncio
-    async def test_tool_selection_with_anthropic_format(self, mock_mcp_client):
-        """Test tool selection works with Anthropic format."""
-        registry = ToolRegistry(mock_mcp_client)
-        executor = ToolExecutor(registry)
-        
-        # Simulate Anthropic tool call (same structure as OpenAI in our implementation)
-        tool_call = ToolCall(
-            id="toolu_abc123",
-            name="list_tables",
-            arguments={"dataset_id": "Analytics"}
-        )
-        
-        result = await executor.execute_single_tool(tool_call)
+    @pytest.mark.parametrize("tool_call", [
+        # OpenAI-style tool call
+        ToolCall(id="call_abc123", name="list_datasets", arguments={}),
+        # Anthropic-style tool call (same structure as OpenAI in our implementation)
+        ToolCall(id="toolu_abc123", name="list_tables", arguments={"dataset_id": "Analytics"}),
+    ], ids=["openai", "anthropic"])
+    async def test_tool_selection_format(self, tool_executor, tool_call):
+        """Test tool selection works with OpenAI and Anthropic formats."""
+        result = await tool_executor.execute_single_tool(tool_call)
         
         assert result["success"] is True
         assert len(result["result"]) == 2
@@ -0,0 +1,133 @@
+"""Shared fixtures for API tests."""
+
+import base64
+import hashlib
+import hmac
+import json
+import time
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+from mcp_bigquery.core.auth import UserContext
+
+
+@pytest.fixture(scope="session")
+def jwt_secret():
+    """Test JWT secret."""
+    return "test-secret-key"
+
+
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+# Static JWT header, encoded once
+_HS256_HEADER = _b64url(b'{"alg":"HS256","typ":"JWT"}')
+
+
+@pytest.fixture(scope="session")
+def make_token(jwt_secret):
+    """Factory for HS256 Supabase-style tokens, signed without PyJWT.
+
+    ``make_token(sub, ttl, email=None)`` returns a token for ``sub`` that
+    expires ``ttl`` seconds from now (negative for an already expired token).
+    """
+    key = jwt_secret.encode()
+
+    def _make_token(sub, ttl, email=None):
+        claims = {"sub": sub, "aud": "authenticated", "exp": int(time.time() + ttl)}
+        if email:
+            claims["email"] = email
+        payload = _b64url(json.dumps(claims, separators=(",", ":")).encode())
+        signing_input = _HS256_HEADER + b"." + payload
+        signature = _b64url(hmac.new(key, signing_input, hashlib.sha256).digest())
+        return (signing_input + b"." + signature).decode()
+
+    return _make_token
+
+
+@pytest.fixture(scope="session")
+def valid_token(make_token):
+    """Valid JWT for user-123, signed once per session."""
+    return make_token("user-123", timedelta(days=1).total_seconds(), email="test@example.com")
+
+
+@pytest.fixture(scope="session")
+def expired_token(make_token):
+    """Expired JWT for user-123."""
+    return make_token("user-123", -timedelta(hours=1).total_seconds(), email="test@example.com")
+
+
+@pytest.fixture(scope="session")
+def make_knowledge_base():
+    """Factory for mock SupabaseKnowledgeBase objects.
+
+    ``make_knowledge_base(profile=None, roles=(), permissions=(), datasets=())``
+    returns a MagicMock whose ``get_user_authz_bundle`` yields those RBAC rows.
+    """
+    def _make_knowledge_base(profile=None, roles=(), permissions=(), datasets=()):
+        kb = MagicMock()
+        kb.get_user_authz_bundle = AsyncMock(return_value={
+            "profile": profile,
+            "roles": list(roles),
+            "permissions": list(permissions),
+            "datasets": list(datasets),
+        })
+        return kb
+
+    return _make_knowledge_base
+
+
+@pytest.fixture(scope="module")
+async def http_client(app):
+    """Async client for the module's ``app`` fixture.
+
+    Startup/shutdown run once per module.
+    """
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as c:
+            yield c
+
+
+@pytest.fixture(scope="package", autouse=True)
+def jwt_env(jwt_secret):
+    """Pin SUPABASE_JWT_SECRET for all API tests, restored afterwards.
+
+    Package scoped so the variable does not leak into other test packages
+    (tests/core checks the unconfigured-secret error).
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("SUPABASE_JWT_SECRET", jwt_secret)
+        yield
+
+
+@pytest.fixture(scope="module", autouse=True)
+def memoized_user_context():
+    """Decode and hydrate each token once per module and knowledge base.
+
+    Wraps ``UserContext.from_token_async`` with a cache keyed on
+    ``(token, id(supabase_kb))`` so repeated requests with the same token
+    against the same knowledge base skip the JWT decode and the RBAC bundle
+    lookup. Failed decodes (expired, invalid) are not cached and still run
+    the real path every time. Tests that need the real path for a cached
+    token request this fixture and ``clear()`` the returned cache.
+    """
+    cache = {}
+    from_token_async = UserContext.from_token_async
+
+    async def cached_from_token_async(token, jwt_secret=None, supabase_kb=None):
+        key = (token, id(supabase_kb))
+        context = cache.get(key)
+        if context is None or context.is_expired():
+            context = await from_token_async(
+                token=token, jwt_secret=jwt_secret, supabase_kb=supabase_kb
+            )
+            cache[key] = context
+        return context
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(UserContext, "from_token_async", cached_from_token_async)
+        yield cache
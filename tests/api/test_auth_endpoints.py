@@ -1,63 +1,32 @@
 """Tests for authenticated API endpoints."""
 
 import pytest
-import jwt
-from datetime import datetime, timedelta, timezone
-from unittest.mock import AsyncMock, MagicMock, patch
-from fastapi.testclient import TestClient
+from datetime import datetime, timezone
+from collections import namedtuple
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
 from fastapi import FastAPI, Depends
 
+from mcp_bigquery.core import auth as auth_module
 from mcp_bigquery.core.auth import UserContext
 from mcp_bigquery.api.dependencies import create_auth_dependency
 from mcp_bigquery.handlers.tools import get_datasets_handler, query_tool_handler
 from mcp_bigquery.routes.tools import create_tools_router
 
 
-@pytest.fixture
-def jwt_secret():
-    """Test JWT secret."""
-    return "test-secret-key-for-testing"
-
-
-@pytest.fixture
-def valid_token(jwt_secret):
-    """Create a valid JWT token for testing."""
-    payload = {
-        "sub": "user-123",
-        "email": "test@example.com",
-        "aud": "authenticated",
-        "exp": datetime.now(timezone.utc) + timedelta(hours=1),
-        "iat": datetime.now(timezone.utc),
-    }
-    return jwt.encode(payload, jwt_secret, algorithm="HS256")
-
-
-@pytest.fixture
-def expired_token(jwt_secret):
-    """Create an expired JWT token for testing."""
-    payload = {
-        "sub": "user-123",
-        "email": "test@example.com",
-        "aud": "authenticated",
-        "exp": datetime.now(timezone.utc) - timedelta(hours=1),
-        "iat": datetime.now(timezone.utc) - timedelta(hours=2),
-    }
-    return jwt.encode(payload, jwt_secret, algorithm="HS256")
+# Plain stand-in for google.cloud.bigquery DatasetListItem
+Dataset = namedtuple("Dataset", "dataset_id")
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_bigquery_client():
     """Mock BigQuery client."""
     client = MagicMock()
-    dataset1 = MagicMock()
-    dataset1.dataset_id = "public_data"
-    dataset2 = MagicMock()
-    dataset2.dataset_id = "private_data"
-    client.list_datasets.return_value = [dataset1, dataset2]
+    client.list_datasets.return_value = [Dataset("public_data"), Dataset("private_data")]
     return client
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_event_manager():
     """Mock event manager."""
     manager = MagicMock()
@@ -65,25 +34,34 @@ def mock_event_manager():
     return manager
 
 
-@pytest.fixture
-def mock_supabase_kb():
-    """Mock SupabaseKnowledgeBase for testing."""
-    kb = MagicMock()
-    kb.get_user_profile = AsyncMock(return_value={
-        "user_id": "user-123",
-        "metadata": {"name": "Test User"}
-    })
-    kb.get_user_roles = AsyncMock(return_value=[
-        {"user_id": "user-123", "role_id": "role-1", "role_name": "analyst"}
-    ])
-    kb.get_role_permissions = AsyncMock(return_value=[
-        {"role_id": "role-1", "permission": "query:execute"},
-        {"role_id": "role-1", "permission": "dataset:list"}
-    ])
-    kb.get_role_dataset_access = AsyncMock(return_value=[
-        {"role_id": "role-1", "dataset_id": "public_data", "table_id": None}
-    ])
-    return kb
+@pytest.fixture(scope="module")
+def mock_supabase_kb(make_knowledge_base):
+    """Mock SupabaseKnowledgeBase, built once per module."""
+    return make_knowledge_base(
+        profile={"user_id": "user-123", "metadata": {"name": "Test User"}},
+        roles=[{"user_id": "user-123", "role_id": "role-1", "role_name": "analyst"}],
+        permissions=[
+            {"role_id": "role-1", "permission": "query:execute"},
+            {"role_id": "role-1", "permission": "dataset:list"}
+        ],
+        datasets=[{"role_id": "role-1", "dataset_id": "public_data", "table_id": None}],
+    )
+
+
+@pytest.fixture(autouse=True)
+def reset_supabase_kb(mock_supabase_kb):
+    """Clear recorded calls on the shared kb; RBAC return values are kept."""
+    yield
+    mock_supabase_kb.reset_mock(return_value=False, side_effect=True)
+
+
+@pytest.fixture(scope="module")
+def app(mock_bigquery_client, mock_event_manager, mock_supabase_kb):
+    """FastAPI app with the tools router, built once per module."""
+    app = FastAPI()
+    router = create_tools_router(mock_bigquery_client, mock_event_manager, mock_supabase_kb)
+    app.include_router(router)
+    return app
 
 
 @pytest.fixture
@@ -113,63 +91,68 @@ def user_context_no_access():
 class TestAuthenticationEndpoints:
     """Tests for endpoint authentication."""
     
-    @pytest.mark.asyncio
-    async def test_missing_auth_token(self, mock_bigquery_client, mock_event_manager, mock_supabase_kb):
+    async def test_missing_auth_token(self, http_client):
         """Test that requests without auth token receive 401."""
-        app = FastAPI()
-        router = create_tools_router(mock_bigquery_client, mock_event_manager, mock_supabase_kb)
-        app.include_router(router)
-        
-        client = TestClient(app)
-        response = client.get("/tools/datasets")
+        response = await http_client.get("/tools/datasets")
         
         assert response.status_code == 401
         assert "authentication" in response.json()["detail"].lower()
     
-    @pytest.mark.asyncio
     async def test_expired_auth_token(
         self,
         expired_token,
-        jwt_secret,
-        mock_bigquery_client,
-        mock_event_manager,
-        mock_supabase_kb
+        http_client
     ):
         """Test that expired tokens receive 401."""
-        with patch.dict('os.environ', {'SUPABASE_JWT_SECRET': jwt_secret}):
-            app = FastAPI()
-            router = create_tools_router(mock_bigquery_client, mock_event_manager, mock_supabase_kb)
-            app.include_router(router)
-            
-            client = TestClient(app)
-            response = client.get(
-                "/tools/datasets",
-                headers={"Authorization": f"Bearer {expired_token}"}
-            )
-            
-            assert response.status_code == 401
-            assert "expired" in response.json()["detail"].lower()
+        response = await http_client.get(
+            "/tools/datasets",
+            headers={"Authorization": f"Bearer {expired_token}"}
+        )
+        
+        assert response.status_code == 401
+        assert "expired" in response.json()["detail"].lower()
     
-    @pytest.mark.asyncio
-    async def test_invalid_auth_token(self, mock_bigquery_client, mock_event_manager, mock_supabase_kb):
+    async def test_invalid_auth_token(self, http_client):
         """Test that invalid tokens receive 401."""
-        app = FastAPI()
-        router = create_tools_router(mock_bigquery_client, mock_event_manager, mock_supabase_kb)
-        app.include_router(router)
-        
-        client = TestClient(app)
-        response = client.get(
+        response = await http_client.get(
             "/tools/datasets",
             headers={"Authorization": "Bearer invalid.token.here"}
         )
         
         assert response.status_code == 401
+    
+    async def test_jwt_decode_uses_precomputed_arguments(
+        self,
+        valid_token,
+        memoized_user_context,
+        monkeypatch,
+        http_client
+    ):
+        """Test that jwt.decode receives the module-level algorithms and options."""
+        calls = []
+        decode = auth_module.jwt.decode
+
+        def recording_decode(*args, **kwargs):
+            calls.append(kwargs)
+            return decode(*args, **kwargs)
+
+        monkeypatch.setattr(auth_module.jwt, "decode", recording_decode)
+        memoized_user_context.clear()
+        response = await http_client.get(
+            "/tools/datasets",
+            headers={"Authorization": f"Bearer {valid_token}"}
+        )
+        
+        assert response.status_code == 200
+        assert len(calls) == 1
+        assert calls[0]["algorithms"] is auth_module._JWT_ALGORITHMS
+        assert calls[0]["options"] is auth_module._JWT_OPTIONS
+        assert calls[0]["audience"] == "authenticated"
 
 
 class TestDatasetAccessControl:
     """Tests for dataset-level access control."""
     
-    @pytest.mark.asyncio
     async def test_user_sees_only_allowed_datasets(
         self,
         mock_bigquery_client,
@@ -186,7 +169,6 @@ class TestDatasetAccessControl:
         assert "public_data" in dataset_ids
         assert "private_data" not in dataset_ids
     
-    @pytest.mark.asyncio
     async def test_user_with_no_access_sees_empty_list(
         self,
         mock_bigquery_client,
@@ -202,7 +184,6 @@ class TestDatasetAccessControl:
 class TestQueryAccessControl:
     """Tests for query-level access control."""
     
-    @pytest.mark.asyncio
     async def test_query_with_unauthorized_table_rejected(
         self,
         mock_bigquery_client,
@@ -227,23 +208,25 @@ class TestQueryAccessControl:
         assert status_code == 403
         assert "access denied" in error_dict["error"].lower()
     
-    @pytest.mark.asyncio
     async def test_query_with_authorized_table_proceeds(
         self,
         mock_bigquery_client,
         mock_event_manager,
-        user_context_with_access
+        user_context_with_access,
+        monkeypatch
     ):
         """Test that queries accessing authorized tables proceed."""
         # Mock the BigQuery client to return a successful result
-        mock_job = MagicMock()
-        mock_job.job_id = "test-job-id"
-        mock_job.total_bytes_processed = 1000
-        mock_job.started = datetime.now(timezone.utc)
-        mock_job.ended = datetime.now(timezone.utc)
-        mock_job.result.return_value = []
+        now = datetime.now(timezone.utc)
+        mock_job = SimpleNamespace(
+            job_id="test-job-id",
+            total_bytes_processed=1000,
+            started=now,
+            ended=now,
+            result=lambda: [],
+        )
         
-        mock_bigquery_client.query.return_value = mock_job
+        monkeypatch.setattr(mock_bigquery_client, "query", MagicMock(return_value=mock_job))
         
         sql = "SELECT * FROM public_data.events"
         
@@ -261,7 +244,6 @@ class TestQueryAccessControl:
         assert "content" in result
         assert result["isError"] is False
     
-    @pytest.mark.asyncio
     async def test_query_without_permission_rejected(
         self,
         mock_bigquery_client,
@@ -295,28 +277,36 @@ class TestQueryAccessControl:
 class TestEndToEndAuthorization:
     """End-to-end authorization tests."""
     
-    @pytest.mark.asyncio
     async def test_full_request_lifecycle_with_valid_auth(
         self,
         valid_token,
-        jwt_secret,
-        mock_bigquery_client,
-        mock_event_manager,
-        mock_supabase_kb
+        http_client
     ):
         """Test full request lifecycle with valid authentication."""
-        with patch.dict('os.environ', {'SUPABASE_JWT_SECRET': jwt_secret}):
-            app = FastAPI()
-            router = create_tools_router(mock_bigquery_client, mock_event_manager, mock_supabase_kb)
-            app.include_router(router)
-            
-            client = TestClient(app)
-            response = client.get(
-                "/tools/datasets",
-                headers={"Authorization": f"Bearer {valid_token}"}
-            )
-            
-            # Should succeed with user's accessible datasets
-            assert response.status_code == 200
-            data = response.json()
-            assert "datasets" in data
+        response = await http_client.get(
+            "/tools/datasets",
+            headers={"Authorization": f"Bearer {valid_token}"}
+        )
+        
+        # Should succeed with user's accessible datasets
+        assert response.status_code == 200
+        data = response.json()
+        assert "datasets" in data
+    
+    async def test_rbac_loaded_with_single_bundle_call(
+        self,
+        valid_token,
+        memoized_user_context,
+        mock_supabase_kb,
+        http_client
+    ):
+        """Test that an authenticated request loads RBAC data in one call."""
+        memoized_user_context.clear()
+        mock_supabase_kb.get_user_authz_bundle.reset_mock()
+        response = await http_client.get(
+            "/tools/datasets",
+            headers={"Authorization": f"Bearer {valid_token}"}
+        )
+        
+        assert response.status_code == 200
+        assert mock_supabase_kb.get_user_authz_bundle.await_count == 1
@@ -1,112 +1,101 @@
 """Tests for chat API routes."""
 
 import pytest
-import jwt
-from datetime import datetime, timedelta, timezone
-from unittest.mock import AsyncMock, MagicMock, patch
+from datetime import timedelta
+from unittest.mock import AsyncMock
 from uuid import uuid4
 from fastapi import FastAPI
-from fastapi.testclient import TestClient
 
 from mcp_bigquery.routes.chat import create_chat_router
 from mcp_bigquery.api.dependencies import create_auth_dependency
+from mcp_bigquery.core.auth import UserContext
 
 
-@pytest.fixture
-def jwt_secret():
-    """Test JWT secret."""
-    return "test-secret-key"
+# Timestamp for mock rows; no test inspects it temporally
+_FIXED_TS = "2024-01-01T10:00:00+00:00"
 
 
-@pytest.fixture
-def valid_token(jwt_secret):
-    """Create a valid JWT token."""
-    payload = {
-        "sub": "user-123",
-        "email": "test@example.com",
-        "aud": "authenticated",
-        "exp": datetime.now(timezone.utc) + timedelta(hours=1),
-    }
-    return jwt.encode(payload, jwt_secret, algorithm="HS256")
+@pytest.fixture(scope="session")
+def two_user_tokens(make_token):
+    """Valid tokens for two different users, signed once per session."""
+    ttl = timedelta(days=1).total_seconds()
+    return (
+        make_token("user-123", ttl, email="user1@example.com"),
+        make_token("user-456", ttl, email="user2@example.com"),
+    )
 
 
-@pytest.fixture
-def expired_token(jwt_secret):
-    """Create an expired JWT token."""
-    payload = {
-        "sub": "user-123",
-        "email": "test@example.com",
-        "aud": "authenticated",
-        "exp": datetime.now(timezone.utc) - timedelta(hours=1),
-    }
-    return jwt.encode(payload, jwt_secret, algorithm="HS256")
+_CHAT_METHODS = (
+    "create_chat_session",
+    "list_chat_sessions",
+    "append_chat_message",
+    "fetch_chat_history",
+    "rename_session",
+    "delete_chat_session",
+)
 
 
-@pytest.fixture
-def mock_knowledge_base():
-    """Mock SupabaseKnowledgeBase."""
-    kb = MagicMock()
-    
-    # Mock RBAC methods
-    kb.get_user_profile = AsyncMock(return_value={
-        "user_id": "user-123",
-        "metadata": {}
-    })
-    kb.get_user_roles = AsyncMock(return_value=[])
-    kb.get_role_permissions = AsyncMock(return_value=[])
-    kb.get_role_dataset_access = AsyncMock(return_value=[])
-    
-    # Mock chat methods
-    kb.create_chat_session = AsyncMock()
-    kb.list_chat_sessions = AsyncMock()
-    kb.append_chat_message = AsyncMock()
-    kb.fetch_chat_history = AsyncMock()
-    kb.rename_session = AsyncMock()
-    kb.delete_chat_session = AsyncMock()
-    
+@pytest.fixture(scope="module")
+def mock_knowledge_base(make_knowledge_base):
+    """Mock SupabaseKnowledgeBase shared by the module-scoped app."""
+    kb = make_knowledge_base(profile={"user_id": "user-123", "metadata": {}})
+    for name in _CHAT_METHODS:
+        setattr(kb, name, AsyncMock())
     return kb
 
 
-@pytest.fixture
-def app(mock_knowledge_base, jwt_secret):
-    """Create test FastAPI app."""
-    import os
-    # Set the JWT secret in environment for the duration of tests
-    original_secret = os.environ.get('SUPABASE_JWT_SECRET')
-    os.environ['SUPABASE_JWT_SECRET'] = jwt_secret
-    
+@pytest.fixture(autouse=True)
+def reset_knowledge_base(mock_knowledge_base):
+    """Clear calls and per-test chat return values on the shared mock."""
+    yield
+    mock_knowledge_base.reset_mock(return_value=False, side_effect=True)
+    for name in _CHAT_METHODS:
+        getattr(mock_knowledge_base, name).reset_mock(return_value=True)
+
+
+@pytest.fixture(scope="module")
+def auth_dependency(mock_knowledge_base):
+    """Real JWT auth dependency used by the chat router."""
+    return create_auth_dependency(mock_knowledge_base)
+
+
+@pytest.fixture(scope="module")
+def app(mock_knowledge_base, auth_dependency):
+    """Create test FastAPI app once per module."""
     app = FastAPI()
-    auth_dependency = create_auth_dependency(mock_knowledge_base)
     chat_router = create_chat_router(mock_knowledge_base, auth_dependency)
     app.include_router(chat_router)
-    
-    yield app
-    
-    # Restore original value
-    if original_secret:
-        os.environ['SUPABASE_JWT_SECRET'] = original_secret
-    else:
-        os.environ.pop('SUPABASE_JWT_SECRET', None)
+    return app
 
 
 @pytest.fixture
-def client(app):
-    """Create test client."""
-    return TestClient(app)
+def client(app, auth_dependency, http_client):
+    """Client with auth stubbed to user-123, for tests not about auth."""
+    app.dependency_overrides[auth_dependency] = lambda: UserContext(
+        user_id="user-123", email="test@example.com"
+    )
+    yield http_client
+    app.dependency_overrides.clear()
 
 
-def test_create_session_success(client, mock_knowledge_base, valid_token):
+@pytest.fixture
+def auth_client(http_client):
+    """Client that runs the real JWT auth dependency."""
+    return http_client
+
+
+async def test_create_session_success(client, mock_knowledge_base, valid_token):
     """Test successful session creation."""
     session_id = str(uuid4())
     mock_knowledge_base.create_chat_session.return_value = {
         "id": session_id,
         "user_id": "user-123",
         "title": "Test Session",
-        "created_at": datetime.now(timezone.utc).isoformat(),
-        "updated_at": datetime.now(timezone.utc).isoformat()
+        "created_at": _FIXED_TS,
+        "updated_at": _FIXED_TS
     }
     
-    response = client.post(
+    response = await client.post(
         "/chat/sessions",
         json={"title": "Test Session"},
         headers={"Authorization": f"Bearer {valid_token}"}
@@ -119,18 +108,18 @@ def test_create_session_success(client, mock_knowledge_base, valid_token):
     assert data["user_id"] == "user-123"
 
 
-def test_create_session_default_title(client, mock_knowledge_base, valid_token):
+async def test_create_session_default_title(client, mock_knowledge_base, valid_token):
     """Test session creation with default title."""
     session_id = str(uuid4())
     mock_knowledge_base.create_chat_session.return_value = {
         "id": session_id,
         "user_id": "user-123",
         "title": "New Conversation",
-        "created_at": datetime.now(timezone.utc).isoformat(),
-        "updated_at": datetime.now(timezone.utc).isoformat()
+        "created_at": _FIXED_TS,
+        "updated_at": _FIXED_TS
     }
     
-    response = client.post(
+    response = await client.post(
         "/chat/sessions",
         json={},
         headers={"Authorization": f"Bearer {valid_token}"}
@@ -141,9 +130,9 @@ def test_create_session_default_title(client, mock_knowledge_base, valid_token):
     assert data["title"] == "New Conversation"
 
 
-def test_create_session_unauthorized(client, mock_knowledge_base):
+async def test_create_session_unauthorized(auth_client, mock_knowledge_base):
     """Test session creation without auth token."""
-    response = client.post(
+    response = await auth_client.post(
         "/chat/sessions",
         json={"title": "Test"}
     )
@@ -151,9 +140,9 @@ def test_create_session_unauthorized(client, mock_knowledge_base):
     assert response.status_code == 401
 
 
-def test_create_session_expired_token(client, mock_knowledge_base, expired_token):
+async def test_create_session_expired_token(auth_client, mock_knowledge_base, expired_token):
     """Test session creation with expired token."""
-    response = client.post(
+    response = await auth_client.post(
         "/chat/sessions",
         json={"title": "Test"},
         headers={"Authorization": f"Bearer {expired_token}"}
@@ -162,7 +151,7 @@ def test_create_session_expired_token(client, mock_knowledge_base, expired_token
     assert response.status_code == 401
 
 
-def test_list_sessions_success(client, mock_knowledge_base, valid_token):
+async def test_list_sessions_success(client, mock_knowledge_base, valid_token):
     """Test listing sessions."""
     mock_knowledge_base.list_chat_sessions.return_value = [
         {
@@ -181,7 +170,7 @@ def test_list_sessions_success(client, mock_knowledge_base, valid_token):
         }
     ]
     
-    response = client.get(
+    response = await client.get(
         "/chat/sessions",
         headers={"Authorization": f"Bearer {valid_token}"}
     )
@@ -192,11 +181,11 @@ def test_list_sessions_success(client, mock_knowledge_base, valid_token):
     assert data[0]["title"] == "Session 1"
 
 
-def test_list_sessions_with_pagination(client, mock_knowledge_base, valid_token):
+async def test_list_sessions_with_pagination(client, mock_knowledge_base, valid_token):
     """Test listing sessions with pagination."""
     mock_knowledge_base.list_chat_sessions.return_value = []
     
-    response = client.get(
+    response = await client.get(
         "/chat/sessions?limit=10&offset=5",
         headers={"Authorization": f"Bearer {valid_token}"}
     )
@@ -208,11 +197,11 @@ def test_list_sessions_with_pagination(client, mock_knowledge_base, valid_token)
     assert call_kwargs["offset"] == 5
 
 
-def test_list_sessions_empty(client, mock_knowledge_base, valid_token):
+async def test_list_sessions_empty(client, mock_knowledge_base, valid_token):
     """Test listing sessions when none exist."""
     mock_knowledge_base.list_chat_sessions.return_value = []
     
-    response = client.get(
+    response = await client.get(
         "/chat/sessions",
         headers={"Authorization": f"Bearer {valid_token}"}
     )
@@ -221,7 +210,7 @@ def test_list_sessions_empty(client, mock_knowledge_base, valid_token):
     assert response.json() == []
 
 
-def test_append_message_success(client, mock_knowledge_base, valid_token):
+async def test_append_message_success(client, mock_knowledge_base, valid_token):
     """Test appending a message to a session."""
     session_id = str(uuid4())
     message_id = str(uuid4())
@@ -232,11 +221,11 @@ def test_append_message_success(client, mock_knowledge_base, valid_token):
         "role": "user",
         "content": "Hello!",
         "metadata": {"test": "data"},
-        "created_at": datetime.now(timezone.utc).isoformat(),
+        "created_at": _FIXED_TS,
         "ordering": 0
     }
     
-    response = client.post(
+    response = await client.post(
         f"/chat/sessions/{session_id}/messages",
         json={
             "role": "user",
@@ -254,11 +243,11 @@ def test_append_message_success(client, mock_knowledge_base, valid_token):
     assert data["ordering"] == 0
 
 
-def test_append_message_invalid_role(client, mock_knowledge_base, valid_token):
+async def test_append_message_invalid_role(client, mock_knowledge_base, valid_token):
     """Test appending message with invalid role."""
     session_id = str(uuid4())
     
-    response = client.post(
+    response = await client.post(
         f"/chat/sessions/{session_id}/messages",
         json={
             "role": "invalid",
@@ -271,24 +260,7 @@ def test_append_message_invalid_role(client, mock_knowledge_base, valid_token):
     assert "Invalid role" in response.json()["detail"]
 
 
-def test_append_message_unauthorized_session(client, mock_knowledge_base, valid_token):
-    """Test appending message to unauthorized session."""
-    session_id = str(uuid4())
-    mock_knowledge_base.append_chat_message.return_value = None
-    
-    response = client.post(
-        f"/chat/sessions/{session_id}/messages",
-        json={
-            "role": "user",
-            "content": "Test"
-        },
-        headers={"Authorization": f"Bearer {valid_token}"}
-    )
-    
-    assert response.status_code == 404
-
-
-def test_fetch_messages_success(client, mock_knowledge_base, valid_token):
+async def test_fetch_messages_success(client, mock_knowledge_base, valid_token):
     """Test fetching chat history."""
     session_id = str(uuid4())
     
@@ -313,7 +285,7 @@ def test_fetch_messages_success(client, mock_knowledge_base, valid_token):
         }
     ]
     
-    response = client.get(
+    response = await client.get(
         f"/chat/sessions/{session_id}/messages",
         headers={"Authorization": f"Bearer {valid_token}"}
     )
@@ -327,21 +299,12 @@ def test_fetch_messages_success(client, mock_knowledge_base, valid_token):
     assert data[1]["role"] == "assistant"
 
 
-def test_fetch_messages_with_limit(client, mock_knowledge_base, valid_token):
+async def test_fetch_messages_with_limit(client, mock_knowledge_base, valid_token):
     """Test fetching chat history with limit."""
     session_id = str(uuid4())
     mock_knowledge_base.fetch_chat_history.return_value = []
     
-    # When empty, the endpoint will check if session exists
-    mock_knowledge_base.list_chat_sessions.return_value = [{
-        "id": session_id,
-        "user_id": "user-123",
-        "title": "Test",
-        "created_at": "2024-01-01T10:00:00Z",
-        "updated_at": "2024-01-01T10:00:00Z"
-    }]
-    
-    response = client.get(
+    response = await client.get(
         f"/chat/sessions/{session_id}/messages?limit=10",
         headers={"Authorization": f"Bearer {valid_token}"}
     )
@@ -352,45 +315,39 @@ def test_fetch_messages_with_limit(client, mock_knowledge_base, valid_token):
     assert call_kwargs["limit"] == 10
 
 
-def test_fetch_messages_empty_session(client, mock_knowledge_base, valid_token):
-    """Test fetching messages from empty session."""
+async def test_fetch_messages_backend_error(client, mock_knowledge_base, valid_token):
+    """Test a failed history read is a 500, not a missing session."""
     session_id = str(uuid4())
+    mock_knowledge_base.fetch_chat_history.side_effect = Exception("Supabase timeout")
     
-    # First return empty messages, then return the session on verification
-    mock_knowledge_base.fetch_chat_history.return_value = []
-    mock_knowledge_base.list_chat_sessions.return_value = [{
-        "id": session_id,
-        "user_id": "user-123",
-        "title": "Test",
-        "created_at": "2024-01-01T10:00:00Z",
-        "updated_at": "2024-01-01T10:00:00Z"
-    }]
-    
-    response = client.get(
+    response = await client.get(
         f"/chat/sessions/{session_id}/messages",
         headers={"Authorization": f"Bearer {valid_token}"}
     )
     
-    assert response.status_code == 200
-    assert response.json() == []
+    assert response.status_code == 500
+    assert response.json()["detail"] == "Failed to fetch chat history"
 
 
-def test_fetch_messages_unauthorized(client, mock_knowledge_base, valid_token):
-    """Test fetching messages from unauthorized session."""
+async def test_fetch_messages_empty_session(client, mock_knowledge_base, valid_token):
+    """Test fetching messages from empty session."""
     session_id = str(uuid4())
     
+    # An owned session with no messages comes back as [] (not None)
     mock_knowledge_base.fetch_chat_history.return_value = []
-    mock_knowledge_base.list_chat_sessions.return_value = []
     
-    response = client.get(
+    response = await client.get(
         f"/chat/sessions/{session_id}/messages",
         headers={"Authorization": f"Bearer {valid_token}"}
     )
     
-    assert response.status_code == 404
+    assert response.status_code == 200
+    assert response.json() == []
+    # No second roundtrip to verify ownership
+    mock_knowledge_base.list_chat_sessions.assert_not_called()
 
 
-def test_rename_session_success(client, mock_knowledge_base, valid_token):
+async def test_rename_session_success(client, mock_knowledge_base, valid_token):
     """Test renaming a session."""
     session_id = str(uuid4())
     
@@ -400,10 +357,10 @@ def test_rename_session_success(client, mock_knowledge_base, valid_token):
         "user_id": "user-123",
         "title": "Updated Title",
         "created_at": "2024-01-01T10:00:00Z",
-        "updated_at": datetime.now(timezone.utc).isoformat()
+        "updated_at": _FIXED_TS
     }]
     
-    response = client.put(
+    response = await client.put(
         f"/chat/sessions/{session_id}",
         json={"title": "Updated Title"},
         headers={"Authorization": f"Bearer {valid_token}"}
@@ -414,26 +371,12 @@ def test_rename_session_success(client, mock_knowledge_base, valid_token):
     assert data["title"] == "Updated Title"
 
 
-def test_rename_session_unauthorized(client, mock_knowledge_base, valid_token):
-    """Test renaming unauthorized session."""
-    session_id = str(uuid4())
-    mock_knowledge_base.rename_session.return_value = False
-    
-    response = client.put(
-        f"/chat/sessions/{session_id}",
-        json={"title": "New Title"},
-        headers={"Authorization": f"Bearer {valid_token}"}
-    )
-    
-    assert response.status_code == 404
-
-
-def test_delete_session_success(client, mock_knowledge_base, valid_token):
+async def test_delete_session_success(client, mock_knowledge_base, valid_token):
     """Test deleting a session."""
     session_id = str(uuid4())
     mock_knowledge_base.delete_chat_session.return_value = True
     
-    response = client.delete(
+    response = await client.delete(
         f"/chat/sessions/{session_id}",
         headers={"Authorization": f"Bearer {valid_token}"}
     )
@@ -441,20 +384,7 @@ def test_delete_session_success(client, mock_knowledge_base, valid_token):
     assert response.status_code == 204
 
 
-def test_delete_session_unauthorized(client, mock_knowledge_base, valid_token):
-    """Test deleting unauthorized session."""
-    session_id = str(uuid4())
-    mock_knowledge_base.delete_chat_session.return_value = False
-    
-    response = client.delete(
-        f"/chat/sessions/{session_id}",
-        headers={"Authorization": f"Bearer {valid_token}"}
-    )
-    
-    assert response.status_code == 404
-
-
-def test_get_session_success(client, mock_knowledge_base, valid_token):
+async def test_get_session_success(client, mock_knowledge_base, valid_token):
     """Test getting a specific session."""
     session_id = str(uuid4())
     
@@ -466,7 +396,7 @@ def test_get_session_success(client, mock_knowledge_base, valid_token):
         "updated_at": "2024-01-01T12:00:00Z"
     }]
     
-    response = client.get(
+    response = await client.get(
         f"/chat/sessions/{session_id}",
         headers={"Authorization": f"Bearer {valid_token}"}
     )
@@ -477,20 +407,52 @@ def test_get_session_success(client, mock_knowledge_base, valid_token):
     assert data["title"] == "Test Session"
 
 
-def test_get_session_not_found(client, mock_knowledge_base, valid_token):
-    """Test getting non-existent session."""
+@pytest.mark.parametrize("method,path,body,mock_values", [
+    pytest.param(
+        "POST", "/messages", {"role": "user", "content": "Test"},
+        {"append_chat_message": None},
+        id="append_message_unauthorized_session",
+    ),
+    pytest.param(
+        "GET", "/messages", None,
+        {"fetch_chat_history": None},
+        id="fetch_messages_unauthorized",
+    ),
+    pytest.param(
+        "PUT", "", {"title": "New Title"},
+        {"rename_session": False},
+        id="rename_session_unauthorized",
+    ),
+    pytest.param(
+        "DELETE", "", None,
+        {"delete_chat_session": False},
+        id="delete_session_unauthorized",
+    ),
+    pytest.param(
+        "GET", "", None,
+        {"list_chat_sessions": []},
+        id="get_session_not_found",
+    ),
+])
+async def test_session_not_owned_returns_404(
+    client, mock_knowledge_base, valid_token, method, path, body, mock_values
+):
+    """Test session endpoints return 404 for sessions the user does not own."""
     session_id = str(uuid4())
-    mock_knowledge_base.list_chat_sessions.return_value = []
+    for attr, value in mock_values.items():
+        getattr(mock_knowledge_base, attr).return_value = value
     
-    response = client.get(
-        f"/chat/sessions/{session_id}",
+    response = await client.request(
+        method,
+        f"/chat/sessions/{session_id}{path}",
+        json=body,
         headers={"Authorization": f"Bearer {valid_token}"}
     )
     
     assert response.status_code == 404
 
 
-def test_message_metadata_preserved(client, mock_knowledge_base, valid_token):
+async def test_message_metadata_preserved(client, mock_knowledge_base, valid_token):
     """Test that message metadata is preserved."""
     session_id = str(uuid4())
     message_id = str(uuid4())
@@ -507,11 +469,11 @@ def test_message_metadata_preserved(client, mock_knowledge_base, valid_token):
         "role": "assistant",
         "content": "Response",
         "metadata": metadata,
-        "created_at": datetime.now(timezone.utc).isoformat(),
+        "created_at": _FIXED_TS,
         "ordering": 1
     }
     
-    response = client.post(
+    response = await client.post(
         f"/chat/sessions/{session_id}/messages",
         json={
             "role": "assistant",
@@ -526,22 +488,9 @@ def test_message_metadata_preserved(client, mock_knowledge_base, valid_token):
     assert data["metadata"] == metadata
 
 
-def test_multiple_users_isolation(client, mock_knowledge_base, jwt_secret):
+async def test_multiple_users_isolation(auth_client, mock_knowledge_base, two_user_tokens):
     """Test that users can only access their own sessions."""
-    # Create tokens for two different users
-    token1 = jwt.encode({
-        "sub": "user-123",
-        "email": "user1@example.com",
-        "aud": "authenticated",
-        "exp": datetime.now(timezone.utc) + timedelta(hours=1),
-    }, jwt_secret, algorithm="HS256")
-    
-    token2 = jwt.encode({
-        "sub": "user-456",
-        "email": "user2@example.com",
-        "aud": "authenticated",
-        "exp": datetime.now(timezone.utc) + timedelta(hours=1),
-    }, jwt_secret, algorithm="HS256")
+    token1, token2 = two_user_tokens
     
     # User 1 creates a session
     session_id = str(uuid4())
@@ -549,11 +498,11 @@ def test_multiple_users_isolation(client, mock_knowledge_base, jwt_secret):
         "id": session_id,
         "user_id": "user-123",
         "title": "User 1 Session",
-        "created_at": datetime.now(timezone.utc).isoformat(),
-        "updated_at": datetime.now(timezone.utc).isoformat()
+        "created_at": _FIXED_TS,
+        "updated_at": _FIXED_TS
     }
     
-    response1 = client.post(
+    response1 = await auth_client.post(
         "/chat/sessions",
         json={"title": "User 1 Session"},
         headers={"Authorization": f"Bearer {token1}"}
@@ -561,10 +510,9 @@ def test_multiple_users_isolation(client, mock_knowledge_base, jwt_secret):
     assert response1.status_code == 201
     
     # User 2 tries to access User 1's session
-    mock_knowledge_base.fetch_chat_history.return_value = []
-    mock_knowledge_base.list_chat_sessions.return_value = []
+    mock_knowledge_base.fetch_chat_history.return_value = None
     
-    response2 = client.get(
+    response2 = await auth_client.get(
         f"/chat/sessions/{session_id}/messages",
         headers={"Authorization": f"Bearer {token2}"}
     )
@@ -1,18 +1,64 @@
 """Tests for client configuration."""
 
 import os
+from collections import ChainMap
+
 import pytest
 from pydantic import ValidationError
 
 from mcp_bigquery.client.config import ClientConfig
 
 
+# Environment variables read by ClientConfig.from_env
+_MCP_ENV_KEYS = (
+    "MCP_BASE_URL",
+    "MCP_AUTH_TOKEN",
+    "MCP_TIMEOUT",
+    "MCP_MAX_RETRIES",
+    "MCP_RETRY_DELAY",
+    "MCP_VERIFY_SSL",
+)
+
+# MCP_VERIFY_SSL spellings (lowercased) that mean True
+_TRUTHY = frozenset({"true", "1", "yes"})
+
+
+@pytest.fixture
+def clean_mcp_env(monkeypatch):
+    """Unset every MCP_* variable read by ClientConfig.from_env."""
+    for key in _MCP_ENV_KEYS:
+        monkeypatch.delenv(key, raising=False)
+
+
+@pytest.fixture
+def envmap(monkeypatch):
+    """Layer a dict of variables over a copy of os.environ for one test.
+
+    Swaps ``os.environ`` in a single step, so it only suits code that reads
+    the environment through Python (``os.getenv``), like ``from_env``.
+    """
+    def _apply(values):
+        monkeypatch.setattr(os, "environ", ChainMap(values, os.environ.copy()))
+    return _apply
+
+
+def _unvalidated(**kwargs):
+    """Build a ClientConfig without running validators, for field-only tests."""
+    return ClientConfig.model_construct(**kwargs)
+
+
+@pytest.fixture(scope="session")
+def base_config():
+    """Default ClientConfig, validated once per session."""
+    return ClientConfig()
+
+
 class TestClientConfig:
     """Tests for ClientConfig."""
     
-    def test_default_config(self):
+    def test_default_config(self, base_config):
         """Test default configuration values."""
-        config = ClientConfig()
+        config = base_config
         assert config.base_url == "http://localhost:8000"
         assert config.auth_token is None
         assert config.timeout == 30.0
@@ -22,7 +68,7 @@ class TestClientConfig:
     
     def test_custom_config(self):
         """Test custom configuration values."""
-        config = ClientConfig(
+        config = _unvalidated(
             base_url="https://api.example.com",
             auth_token="test-token",
             timeout=60.0,
@@ -45,44 +91,33 @@ class TestClientConfig:
         config = ClientConfig(base_url="http://localhost:8000///")
         assert config.base_url == "http://localhost:8000"
     
-    def test_base_url_validation_empty(self):
-        """Test base URL validation rejects empty strings."""
-        with pytest.raises(ValidationError) as exc_info:
-            ClientConfig(base_url="")
-        assert "base_url cannot be empty" in str(exc_info.value)
+    @pytest.mark.parametrize("kwargs,msg", [
+        pytest.param({"base_url": ""}, "base_url cannot be empty", id="empty_base_url"),
+        pytest.param(
+            {"base_url": "localhost:8000"},
+            "must start with http:// or https://",
+            id="base_url_protocol",
+        ),
+        pytest.param({"timeout": 0}, "timeout must be positive", id="zero_timeout"),
+        pytest.param({"timeout": -1}, "timeout must be positive", id="negative_timeout"),
+        pytest.param(
+            {"max_retries": -1},
+            "max_retries must be non-negative",
+            id="negative_max_retries",
+        ),
+    ])
+    def test_validation_errors(self, kwargs, msg):
+        """Test validators reject invalid field values."""
+        with pytest.raises(ValidationError, match=msg):
+            ClientConfig(**kwargs)
     
-    def test_base_url_validation_protocol(self):
-        """Test base URL validation requires http:// or https://."""
-        with pytest.raises(ValidationError) as exc_info:
-            ClientConfig(base_url="localhost:8000")
-        assert "must start with http:// or https://" in str(exc_info.value)
-    
-    def test_timeout_validation(self):
-        """Test timeout validation requires positive value."""
-        with pytest.raises(ValidationError) as exc_info:
-            ClientConfig(timeout=0)
-        assert "timeout must be positive" in str(exc_info.value)
-        
-        with pytest.raises(ValidationError) as exc_info:
-            ClientConfig(timeout=-1)
-        assert "timeout must be positive" in str(exc_info.value)
-    
-    def test_max_retries_validation(self):
-        """Test max_retries validation requires non-negative value."""
+    def test_max_retries_zero_allowed(self):
+        """Test max_retries accepts zero."""
         config = ClientConfig(max_retries=0)
         assert config.max_retries == 0
-        
-        with pytest.raises(ValidationError) as exc_info:
-            ClientConfig(max_retries=-1)
-        assert "max_retries must be non-negative" in str(exc_info.value)
     
-    def test_from_env_defaults(self, monkeypatch):
+    def test_from_env_defaults(self, clean_mcp_env):
         """Test loading configuration from environment with defaults."""
-        # Clear relevant env vars
-        for key in ['MCP_BASE_URL', 'MCP_AUTH_TOKEN', 'MCP_TIMEOUT', 
-                    'MCP_MAX_RETRIES', 'MCP_RETRY_DELAY', 'MCP_VERIFY_SSL']:
-            monkeypatch.delenv(key, raising=False)
-        
         config = ClientConfig.from_env()
         assert config.base_url == "http://localhost:8000"
         assert config.auth_token is None
@@ -91,14 +126,16 @@ class TestClientConfig:
         assert config.retry_delay == 1.0
         assert config.verify_ssl is True
     
-    def test_from_env_custom(self, monkeypatch):
+    def test_from_env_custom(self, envmap):
         """Test loading configuration from environment with custom values."""
-        monkeypatch.setenv('MCP_BASE_URL', 'https://api.example.com')
-        monkeypatch.setenv('MCP_AUTH_TOKEN', 'test-token')
-        monkeypatch.setenv('MCP_TIMEOUT', '60.0')
-        monkeypatch.setenv('MCP_MAX_RETRIES', '5')
-        monkeypatch.setenv('MCP_RETRY_DELAY', '2.0')
-        monkeypatch.setenv('MCP_VERIFY_SSL', 'false')
+        envmap({
+            'MCP_BASE_URL': 'https://api.example.com',
+            'MCP_AUTH_TOKEN': 'test-token',
+            'MCP_TIMEOUT': '60.0',
+            'MCP_MAX_RETRIES': '5',
+            'MCP_RETRY_DELAY': '2.0',
+            'MCP_VERIFY_SSL': 'false',
+        })
         
         config = ClientConfig.from_env()
         assert config.base_url == "https://api.example.com"
@@ -108,22 +145,20 @@ class TestClientConfig:
         assert config.retry_delay == 2.0
         assert config.verify_ssl is False
     
-    def test_from_env_verify_ssl_variants(self, monkeypatch):
-        """Test verify_ssl accepts various truthy/falsy values."""
-        for value in ['true', 'True', 'TRUE', '1', 'yes']:
-            monkeypatch.setenv('MCP_VERIFY_SSL', value)
-            config = ClientConfig.from_env()
-            assert config.verify_ssl is True, f"Failed for value: {value}"
-        
-        for value in ['false', 'False', 'FALSE', '0', 'no', 'anything']:
-            monkeypatch.setenv('MCP_VERIFY_SSL', value)
-            config = ClientConfig.from_env()
-            assert config.verify_ssl is False, f"Failed for value: {value}"
+    @pytest.mark.parametrize("value", [
+        'true', 'True', 'TRUE', '1', 'yes',
+        'false', 'False', 'FALSE', '0', 'no', 'anything',
+    ])
+    def test_parse_verify_ssl_variants(self, value):
+        """Test MCP_VERIFY_SSL parsing of various truthy/falsy values."""
+        assert ClientConfig._parse_verify_ssl(value) is (value.lower() in _TRUTHY)
     
-    def test_from_env_with_overrides(self, monkeypatch):
+    def test_from_env_with_overrides(self, clean_mcp_env, envmap):
         """Test from_env with override parameters."""
-        monkeypatch.setenv('MCP_BASE_URL', 'http://env.example.com')
-        monkeypatch.setenv('MCP_TIMEOUT', '60.0')
+        envmap({
+            'MCP_BASE_URL': 'http://env.example.com',
+            'MCP_TIMEOUT': '60.0',
+        })
         
         config = ClientConfig.from_env(
             base_url='http://override.example.com',
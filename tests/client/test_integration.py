@@ -6,30 +6,40 @@ They are marked as integration tests and skipped by default.
 Run with: pytest tests/client/test_integration.py -v -m integration
 """
 
+import asyncio
 import os
+
 import pytest
-from mcp_bigquery.client import (
-    MCPClient,
-    ClientConfig,
-    AuthenticationError,
-    AuthorizationError,
-)
 
 # Mark all tests in this module as integration tests
 pytestmark = pytest.mark.integration
 
+# Values of RUN_INTEGRATION_TESTS that enable this module
+_TRUTHY = frozenset({"true", "1", "yes"})
+
+_SKIP_REASON = "Integration tests disabled (set RUN_INTEGRATION_TESTS=true to enable)"
+
 
-def should_run_integration_tests():
+def should_run_integration_tests() -> bool:
     """Check if integration tests should run."""
-    return os.getenv("RUN_INTEGRATION_TESTS", "").lower() in ("true", "1", "yes")
+    return os.getenv("RUN_INTEGRATION_TESTS", "").lower() in _TRUTHY
 
 
-@pytest.fixture
+# Skip the whole module before any test or fixture is collected
+if not should_run_integration_tests():
+    pytest.skip(_SKIP_REASON, allow_module_level=True)
+
+from mcp_bigquery.client import (  # noqa: E402
+    AuthenticationError,
+    AuthorizationError,
+    ClientConfig,
+    MCPClient,
+)
+
+
+@pytest.fixture(scope="module")
 def integration_config():
     """Create config for integration tests from environment."""
-    if not should_run_integration_tests():
-        pytest.skip("Integration tests disabled (set RUN_INTEGRATION_TESTS=true to enable)")
-    
     base_url = os.getenv("MCP_BASE_URL", "http://localhost:8000")
     auth_token = os.getenv("MCP_AUTH_TOKEN")
     
@@ -43,30 +53,52 @@ def integration_config():
     )
 
 
+@pytest.fixture(scope="module")
+async def shared_client(integration_config):
+    """One MCPClient, and its connection pool, shared by the module's tests."""
+    async with MCPClient(integration_config) as client:
+        yield client
+
+
+@pytest.fixture(scope="module")
+async def first_dataset_tables(shared_client):
+    """First dataset ID and its list_tables result, fetched once per module."""
+    datasets = (await shared_client.list_datasets()).get("datasets") or []
+    if not datasets:
+        pytest.skip("No datasets available")
+    
+    dataset_id = datasets[0]
+    return dataset_id, await shared_client.list_tables(dataset_id)
+
+
 class TestIntegrationBasicOperations:
     """Integration tests for basic client operations."""
     
-    @pytest.mark.asyncio
-    async def test_list_datasets(self, integration_config):
+    async def test_smoke_concurrent(self, shared_client):
+        """Test listing datasets and a simple query, issued concurrently."""
+        datasets, select = await asyncio.gather(
+            shared_client.list_datasets(),
+            shared_client.execute_sql("SELECT 1 as test_column"),
+        )
+        assert type(datasets["datasets"]) is list
+        assert "rows" in select or "error" not in select
+    
+    # Covered by test_smoke_concurrent; kept for isolating failures
+    @pytest.mark.slow
+    async def test_list_datasets(self, shared_client):
         """Test listing datasets with real server."""
-        async with MCPClient(integration_config) as client:
-            result = await client.list_datasets()
-            assert "datasets" in result
-            assert isinstance(result["datasets"], list)
+        result = await shared_client.list_datasets()
+        assert "datasets" in result
+        assert type(result["datasets"]) is list
     
-    @pytest.mark.asyncio
-    async def test_execute_simple_query(self, integration_config):
+    @pytest.mark.slow
+    async def test_execute_simple_query(self, shared_client):
         """Test executing a simple query."""
-        async with MCPClient(integration_config) as client:
-            result = await client.execute_sql("SELECT 1 as test_column")
-            assert "rows" in result or "error" not in result
+        result = await shared_client.execute_sql("SELECT 1 as test_column")
+        assert "rows" in result or "error" not in result
     
-    @pytest.mark.asyncio
     async def test_invalid_token(self):
         """Test that invalid token raises AuthenticationError."""
-        if not should_run_integration_tests():
-            pytest.skip("Integration tests disabled (set RUN_INTEGRATION_TESTS=true to enable)")
-        
         config = ClientConfig(
             base_url=os.getenv("MCP_BASE_URL", "http://localhost:8000"),
             auth_token="invalid-token"
@@ -80,103 +112,75 @@ class TestIntegrationBasicOperations:
 class TestIntegrationDatasetOperations:
     """Integration tests for dataset and table operations."""
     
-    @pytest.mark.asyncio
-    async def test_list_tables_in_dataset(self, integration_config):
+    async def test_list_tables_in_dataset(self, first_dataset_tables):
         """Test listing tables in a dataset."""
-        async with MCPClient(integration_config) as client:
-            # First get a dataset
-            datasets_result = await client.list_datasets()
-            
-            if datasets_result.get("datasets"):
-                dataset_id = datasets_result["datasets"][0]
-                
-                # List tables in the dataset
-                tables_result = await client.list_tables(dataset_id)
-                assert "tables" in tables_result or "error" not in tables_result
+        _, tables_result = first_dataset_tables
+        assert "tables" in tables_result or "error" not in tables_result
     
-    @pytest.mark.asyncio
-    async def test_get_table_schema(self, integration_config):
+    async def test_get_table_schema(self, shared_client, first_dataset_tables):
         """Test getting table schema."""
-        async with MCPClient(integration_config) as client:
-            # Get datasets
-            datasets_result = await client.list_datasets()
+        dataset_id, tables_result = first_dataset_tables
+        
+        if tables_result.get("tables"):
+            table_id = tables_result["tables"][0]
             
-            if datasets_result.get("datasets"):
-                dataset_id = datasets_result["datasets"][0]
-                
-                # Get tables
-                tables_result = await client.list_tables(dataset_id)
-                
-                if tables_result.get("tables"):
-                    table_id = tables_result["tables"][0]
-                    
-                    # Get schema
-                    schema_result = await client.get_table_schema(
-                        dataset_id=dataset_id,
-                        table_id=table_id
-                    )
-                    assert "schema" in schema_result or "error" not in schema_result
+            # Get schema
+            schema_result = await shared_client.get_table_schema(
+                dataset_id=dataset_id,
+                table_id=table_id
+            )
+            assert "schema" in schema_result or "error" not in schema_result
 
 
 class TestIntegrationStreaming:
     """Integration tests for streaming functionality."""
     
-    @pytest.mark.asyncio
-    async def test_stream_events_basic(self, integration_config):
+    async def test_stream_events_basic(self, shared_client):
         """Test basic event streaming."""
-        async with MCPClient(integration_config) as client:
-            # Connect to stream and receive at least one event
-            event_count = 0
-            
-            try:
-                async for event in client.stream_events(channel="system"):
-                    event_count += 1
-                    assert isinstance(event, dict)
-                    
-                    # Just verify we can receive events, then break
-                    if event_count >= 1:
-                        break
-            except Exception as e:
-                # Streaming might not be available on all servers
-                pytest.skip(f"Streaming not available: {e}")
+        # Connect to stream and receive one event, bounded so a quiet
+        # channel cannot hang the run
+        events = shared_client.stream_events(channel="system")
+        
+        try:
+            event = await asyncio.wait_for(events.__anext__(), timeout=5.0)
+            assert type(event) is dict
+        except Exception as e:
+            # Streaming might not be available on all servers
+            pytest.skip(f"Streaming not available: {e}")
+        finally:
+            await events.aclose()
 
 
 class TestIntegrationCacheOperations:
     """Integration tests for cache operations."""
     
-    @pytest.mark.asyncio
-    async def test_get_cache_stats(self, integration_config):
+    async def test_get_cache_stats(self, shared_client):
         """Test getting cache statistics."""
-        async with MCPClient(integration_config) as client:
-            try:
-                result = await client.manage_cache(action="get_stats")
-                assert isinstance(result, dict)
-            except Exception as e:
-                # Cache operations might require special permissions
-                if "403" not in str(e) and "AuthorizationError" not in str(type(e).__name__):
-                    raise
+        try:
+            result = await shared_client.manage_cache(action="get_stats")
+            assert type(result) is dict
+        except Exception as e:
+            # Cache operations might require special permissions
+            if "403" not in str(e) and "AuthorizationError" not in str(type(e).__name__):
+                raise
 
 
 class TestIntegrationErrorHandling:
     """Integration tests for error handling."""
     
-    @pytest.mark.asyncio
-    async def test_invalid_sql_query(self, integration_config):
+    async def test_invalid_sql_query(self, shared_client):
         """Test that invalid SQL raises appropriate error."""
-        async with MCPClient(integration_config) as client:
-            with pytest.raises(Exception):  # Could be ValidationError or ServerError
-                await client.execute_sql("SELECT * FROM nonexistent_table_xyz")
+        with pytest.raises(Exception):  # Could be ValidationError or ServerError
+            await shared_client.execute_sql("SELECT * FROM nonexistent_table_xyz")
     
-    @pytest.mark.asyncio
-    async def test_unauthorized_table_access(self, integration_config):
+    async def test_unauthorized_table_access(self, shared_client):
         """Test access to unauthorized table."""
-        async with MCPClient(integration_config) as client:
-            # Try to access a table that likely doesn't exist or isn't accessible
-            try:
-                await client.get_table_schema(
-                    dataset_id="unauthorized_dataset",
-                    table_id="unauthorized_table"
-                )
-            except (AuthorizationError, Exception):
-                # Expected - either authorization error or not found
-                pass
+        # Try to access a table that likely doesn't exist or isn't accessible
+        try:
+            await shared_client.get_table_schema(
+                dataset_id="unauthorized_dataset",
+                table_id="unauthorized_table"
+            )
+        except (AuthorizationError, Exception):
+            # Expected - either authorization error or not found
+            pass
@@ -1,8 +1,9 @@
 """Tests for MCP BigQuery client."""
 
 import json
+import re
 import pytest
-from unittest.mock import AsyncMock, Mock, patch
+from unittest.mock import AsyncMock, Mock
 import httpx
 
 from mcp_bigquery.client import (
@@ -14,11 +15,46 @@ from mcp_bigquery.client import (
     ServerError,
     NetworkError,
 )
+from mcp_bigquery.client import mcp_client as _mc
 
 
-@pytest.fixture
+# Canned JSON bodies for the API method tests, built once at import
+_EXEC_SQL_RESP = {"rows": [{"col1": "value1"}], "total_rows": 1}
+_EMPTY_ROWS_RESP = {"rows": []}
+_DATASETS_RESP = {"datasets": ["dataset1", "dataset2"]}
+_TABLES_RESP = {"tables": ["table1", "table2"]}
+_SCHEMA_RESP = {"schema": [{"name": "col1", "type": "STRING"}]}
+_EXPLAIN_RESP = {"explanation": "Table details", "usage_stats": {}}
+_SUGGESTIONS_RESP = {"suggestions": ["SELECT * FROM table1"]}
+_ANALYSIS_RESP = {"analysis": "Performance details"}
+_SCHEMA_CHANGES_RESP = {"changes": []}
+_CACHE_RESP = {"result": "Cache cleared"}
+
+# NDJSON lines for the streaming tests, serialized once at import
+_STREAM_LINES = (
+    json.dumps({"type": "connection_established", "client_id": "123"}),
+    json.dumps({"type": "query_started", "query_id": "q1"}),
+    json.dumps({"type": "query_completed", "query_id": "q1"}),
+)
+_HEARTBEAT_STREAM_LINES = (
+    json.dumps({"type": "event1"}),
+    "",
+    "\n",
+    json.dumps({"type": "event2"}),
+)
+
+# Error message patterns, compiled once at import
+_INVALID_TOKEN = re.compile(r"Invalid token")
+_ACCESS_DENIED = re.compile(r"Access denied")
+_INVALID_INPUT = re.compile(r"Invalid input")
+_UNAUTHORIZED = re.compile(r"Unauthorized")
+_TIMEOUT = re.compile(r"timeout", re.I)
+_CONNECTION_FAILED = re.compile(r"Connection failed")
+
+
+@pytest.fixture(scope="session")
 def client_config():
-    """Create a test client configuration."""
+    """Create a test client configuration, shared read-only across tests."""
     return ClientConfig(
         base_url="http://localhost:8000",
         auth_token="test-token",
@@ -28,37 +64,119 @@ def client_config():
     )
 
 
+class _StubClient:
+    """Stand-in for httpx.AsyncClient with only the members MCPClient uses."""
+    
+    def __init__(self):
+        self.reset()
+    
+    def reset(self):
+        """Swap in fresh mocks, dropping any per-test wiring and call records."""
+        self.is_closed = False
+        self.request = AsyncMock()
+        self.aclose = AsyncMock()
+        self.stream = Mock()
+    
+    def attempts(self):
+        """(request calls, aclose calls), for per-attempt retry checks."""
+        return self.request.call_count, self.aclose.call_count
+
+
+@pytest.fixture(scope="class")
+def shared_http_client():
+    """One stub HTTP client per test class."""
+    return _StubClient()
+
+
+@pytest.fixture
+def mock_http_client(shared_http_client):
+    """The class's stub HTTP client, reset for this test."""
+    shared_http_client.reset()
+    return shared_http_client
+
+
+@pytest.fixture
+def _patch_httpx(monkeypatch, mock_http_client):
+    """Make every httpx.AsyncClient built by MCPClient return mock_http_client.
+
+    Applied with ``usefixtures`` to the classes whose tests make requests.
+    """
+    monkeypatch.setattr(_mc.httpx, "AsyncClient", lambda *args, **kwargs: mock_http_client)
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    """Skip retry backoff sleeps; returns the list of requested delays."""
+    delays = []
+    
+    async def _sleep(delay):
+        delays.append(delay)
+    
+    monkeypatch.setattr(_mc.asyncio, "sleep", _sleep)
+    return delays
+
+
+@pytest.fixture
+def respond(mock_http_client):
+    """Make mock_http_client.request return a response with the given JSON body.
+
+    ``respond(payload, status=200)`` returns the response mock.
+    """
+    def _respond(payload, status=200):
+        response = Mock(status_code=status)
+        response.json = lambda: payload
+        mock_http_client.request = AsyncMock(return_value=response)
+        return response
+    return _respond
+
+
+@pytest.fixture(scope="class")
+def client(client_config):
+    """One MCPClient per test class; it holds no per-request state."""
+    return MCPClient(client_config)
+
+
 @pytest.fixture
-def mock_http_client():
-    """Create a mock HTTP client."""
-    mock = AsyncMock(spec=httpx.AsyncClient)
-    mock.is_closed = False
-    return mock
+def connected_client(client_config, mock_http_client):
+    """MCPClient holding mock_http_client as its persistent httpx client."""
+    client = MCPClient(client_config)
+    client._client = mock_http_client
+    return client
 
 
+@pytest.mark.usefixtures("_patch_httpx")
 class TestMCPClientInitialization:
     """Tests for MCPClient initialization and lifecycle."""
     
-    def test_init(self, client_config):
+    def test_init(self, client, client_config):
         """Test client initialization."""
-        client = MCPClient(client_config)
         assert client.config == client_config
     
-    @pytest.mark.asyncio
     async def test_context_manager(self, client_config):
         """Test async context manager."""
         async with MCPClient(client_config) as client:
             assert isinstance(client, MCPClient)
     
-    @pytest.mark.asyncio
-    async def test_close(self, client_config):
-        """Test explicit close (no-op for backwards compatibility)."""
-        client = MCPClient(client_config)
+    async def test_context_manager_reuses_one_client(self, client_config, mock_http_client, respond):
+        """Test requests inside async with share one client, closed on exit."""
+        respond({"result": "success"})
+        
+        async with MCPClient(client_config) as client:
+            assert client._client is mock_http_client
+            await client.list_datasets()
+            await client.list_datasets()
+            assert mock_http_client.aclose.call_count == 0
+        
+        assert mock_http_client.request.call_count == 2
+        mock_http_client.aclose.assert_called_once()
+        assert client._client is None
+    
+    async def test_close(self, client):
+        """Test explicit close without an open client is a no-op."""
         await client.close()
     
-    def test_get_headers_with_token(self, client_config):
+    def test_get_headers_with_token(self, client):
         """Test headers include auth token."""
-        client = MCPClient(client_config)
         headers = client._get_headers()
         assert headers["Authorization"] == "Bearer test-token"
         assert headers["Content-Type"] == "application/json"
@@ -72,140 +190,82 @@ class TestMCPClientInitialization:
         assert headers["Content-Type"] == "application/json"
 
 
+@pytest.mark.usefixtures("_patch_httpx")
 class TestMCPClientRequests:
     """Tests for HTTP request handling."""
     
-    @pytest.mark.asyncio
-    async def test_make_request_success(self, client_config, mock_http_client):
+    async def test_make_request_success(self, client, mock_http_client, respond):
         """Test successful request."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"result": "success"}
-        mock_http_client.request = AsyncMock(return_value=mock_response)
+        respond({"result": "success"})
         
-        client = MCPClient(client_config)
+        result = await client._make_request("GET", "/test")
         
-        with patch('mcp_bigquery.client.mcp_client.httpx.AsyncClient', return_value=mock_http_client):
-            result = await client._make_request("GET", "/test")
-            
-            assert result == {"result": "success"}
-            mock_http_client.request.assert_called_once()
-            mock_http_client.aclose.assert_called_once()
+        assert result == {"result": "success"}
+        mock_http_client.request.assert_called_once()
+        mock_http_client.aclose.assert_called_once()
     
-    @pytest.mark.asyncio
-    async def test_make_request_with_json_data(self, client_config, mock_http_client):
+    async def test_make_request_with_json_data(self, client, mock_http_client, respond):
         """Test request with JSON data."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"result": "success"}
-        mock_http_client.request = AsyncMock(return_value=mock_response)
-        
-        client = MCPClient(client_config)
-        
-        with patch('mcp_bigquery.client.mcp_client.httpx.AsyncClient', return_value=mock_http_client):
-            await client._make_request(
-                "POST",
-                "/test",
-                json_data={"key": "value"}
-            )
-            
-            call_args = mock_http_client.request.call_args
-            assert call_args[1]["json"] == {"key": "value"}
-            mock_http_client.aclose.assert_called_once()
+        respond({"result": "success"})
+        
+        await client._make_request(
+            "POST",
+            "/test",
+            json_data={"key": "value"}
+        )
+        
+        call_args = mock_http_client.request.call_args
+        assert call_args[1]["json"] == {"key": "value"}
+        mock_http_client.aclose.assert_called_once()
     
-    @pytest.mark.asyncio
-    async def test_make_request_with_params(self, client_config, mock_http_client):
+    async def test_make_request_with_params(self, client, mock_http_client, respond):
         """Test request with query parameters."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"result": "success"}
-        mock_http_client.request = AsyncMock(return_value=mock_response)
-        
-        client = MCPClient(client_config)
-        
-        with patch('mcp_bigquery.client.mcp_client.httpx.AsyncClient', return_value=mock_http_client):
-            await client._make_request(
-                "GET",
-                "/test",
-                params={"param1": "value1"}
-            )
-            
-            call_args = mock_http_client.request.call_args
-            assert call_args[1]["params"] == {"param1": "value1"}
-            mock_http_client.aclose.assert_called_once()
-    
-    @pytest.mark.asyncio
-    async def test_authentication_error(self, client_config, mock_http_client):
-        """Test 401 raises AuthenticationError."""
-        mock_response = Mock()
-        mock_response.status_code = 401
-        mock_response.json.return_value = {"error": "Invalid token"}
-        mock_http_client.request = AsyncMock(return_value=mock_response)
+        respond({"result": "success"})
         
-        client = MCPClient(client_config)
+        await client._make_request(
+            "GET",
+            "/test",
+            params={"param1": "value1"}
+        )
         
-        with patch('mcp_bigquery.client.mcp_client.httpx.AsyncClient', return_value=mock_http_client):
-            with pytest.raises(AuthenticationError) as exc_info:
-                await client._make_request("GET", "/test")
-            
-            assert "Invalid token" in str(exc_info.value)
-            mock_http_client.aclose.assert_called_once()
-    
-    @pytest.mark.asyncio
-    async def test_authorization_error(self, client_config, mock_http_client):
-        """Test 403 raises AuthorizationError."""
-        mock_response = Mock()
-        mock_response.status_code = 403
-        mock_response.json.return_value = {"error": "Access denied"}
-        mock_http_client.request = AsyncMock(return_value=mock_response)
-        
-        client = MCPClient(client_config)
-        
-        with patch('mcp_bigquery.client.mcp_client.httpx.AsyncClient', return_value=mock_http_client):
-            with pytest.raises(AuthorizationError) as exc_info:
-                await client._make_request("GET", "/test")
-            
-            assert "Access denied" in str(exc_info.value)
-            mock_http_client.aclose.assert_called_once()
-    
-    @pytest.mark.asyncio
-    async def test_validation_error(self, client_config, mock_http_client):
-        """Test 400 raises ValidationError."""
-        mock_response = Mock()
-        mock_response.status_code = 400
-        mock_response.json.return_value = {"detail": "Invalid input"}
-        mock_http_client.request = AsyncMock(return_value=mock_response)
-        
-        client = MCPClient(client_config)
-        
-        with patch('mcp_bigquery.client.mcp_client.httpx.AsyncClient', return_value=mock_http_client):
-            with pytest.raises(ValidationError) as exc_info:
-                await client._make_request("GET", "/test")
-            
-            assert "Invalid input" in str(exc_info.value)
-            mock_http_client.aclose.assert_called_once()
-    
-    @pytest.mark.asyncio
-    async def test_server_error_retry(self, client_config, mock_http_client):
+        call_args = mock_http_client.request.call_args
+        assert call_args[1]["params"] == {"param1": "value1"}
+        mock_http_client.aclose.assert_called_once()
+    
+    @pytest.mark.parametrize("status,exc,msg_key,msg", [
+        pytest.param(401, AuthenticationError, "error", _INVALID_TOKEN, id="401"),
+        pytest.param(403, AuthorizationError, "error", _ACCESS_DENIED, id="403"),
+        pytest.param(400, ValidationError, "detail", _INVALID_INPUT, id="400"),
+        pytest.param(401, AuthenticationError, "error", _UNAUTHORIZED, id="401_no_retry"),
+    ])
+    async def test_http_error(
+        self, client, mock_http_client, respond, status, exc, msg_key, msg
+    ):
+        """Test 4xx responses raise the mapped error without retrying."""
+        respond({msg_key: msg.pattern}, status=status)
+        
+        with pytest.raises(exc) as exc_info:
+            await client._make_request("GET", "/test")
+        
+        exc_info.match(msg)
+        # Should not retry
+        assert mock_http_client.request.call_count == 1
+        mock_http_client.aclose.assert_called_once()
+    
+    async def test_server_error_retry(self, client, mock_http_client, respond, no_sleep):
         """Test server error triggers retry."""
-        mock_response = Mock()
-        mock_response.status_code = 500
-        mock_response.json.return_value = {"error": "Internal error"}
-        mock_http_client.request = AsyncMock(return_value=mock_response)
-        
-        client = MCPClient(client_config)
-        
-        with patch('mcp_bigquery.client.mcp_client.httpx.AsyncClient', return_value=mock_http_client):
-            with pytest.raises(ServerError):
-                await client._make_request("GET", "/test")
-            
-            # Should retry max_retries + 1 times (initial + retries)
-            assert mock_http_client.request.call_count == 3
-            # aclose called 3 times (once per attempt)
-            assert mock_http_client.aclose.call_count == 3
+        respond({"error": "Internal error"}, status=500)
+        
+        with pytest.raises(ServerError):
+            await client._make_request("GET", "/test")
+        
+        # Should retry max_retries + 1 times (initial + retries),
+        # with one client opened and closed per attempt
+        assert mock_http_client.attempts() == (3, 3)
+        # Exponential backoff from retry_delay=0.1
+        assert no_sleep == [0.1, 0.2]
     
-    @pytest.mark.asyncio
-    async def test_server_error_eventual_success(self, client_config, mock_http_client):
+    async def test_server_error_eventual_success(self, client, mock_http_client, no_sleep):
         """Test server error succeeds on retry."""
         responses = [
             Mock(status_code=500, json=lambda: {"error": "Error"}),
@@ -213,322 +273,128 @@ class TestMCPClientRequests:
         ]
         mock_http_client.request = AsyncMock(side_effect=responses)
         
-        client = MCPClient(client_config)
-        
-        with patch('mcp_bigquery.client.mcp_client.httpx.AsyncClient', return_value=mock_http_client):
-            result = await client._make_request("GET", "/test")
-            assert result == {"result": "success"}
-            assert mock_http_client.request.call_count == 2
-            # aclose called 2 times (once per attempt)
-            assert mock_http_client.aclose.call_count == 2
+        result = await client._make_request("GET", "/test")
+        assert result == {"result": "success"}
+        # One client opened and closed per attempt
+        assert mock_http_client.attempts() == (2, 2)
     
-    @pytest.mark.asyncio
-    async def test_timeout_retry(self, client_config, mock_http_client):
+    async def test_timeout_retry(self, client, mock_http_client, no_sleep):
         """Test timeout triggers retry."""
         mock_http_client.request = AsyncMock(side_effect=httpx.TimeoutException("Timeout"))
         
-        client = MCPClient(client_config)
+        with pytest.raises(NetworkError) as exc_info:
+            await client._make_request("GET", "/test")
         
-        with patch('mcp_bigquery.client.mcp_client.httpx.AsyncClient', return_value=mock_http_client):
-            with pytest.raises(NetworkError) as exc_info:
-                await client._make_request("GET", "/test")
-            
-            assert "timeout" in str(exc_info.value).lower()
-            assert mock_http_client.request.call_count == 3
-            assert mock_http_client.aclose.call_count == 3
+        exc_info.match(_TIMEOUT)
+        assert mock_http_client.attempts() == (3, 3)
     
-    @pytest.mark.asyncio
-    async def test_network_error_retry(self, client_config, mock_http_client):
+    async def test_network_error_retry(self, client, mock_http_client, no_sleep):
         """Test network error triggers retry."""
         mock_http_client.request = AsyncMock(
             side_effect=httpx.NetworkError("Connection failed")
         )
         
-        client = MCPClient(client_config)
-        
-        with patch('mcp_bigquery.client.mcp_client.httpx.AsyncClient', return_value=mock_http_client):
-            with pytest.raises(NetworkError) as exc_info:
-                await client._make_request("GET", "/test")
-            
-            assert "Connection failed" in str(exc_info.value)
-            assert mock_http_client.request.call_count == 3
-            assert mock_http_client.aclose.call_count == 3
-    
-    @pytest.mark.asyncio
-    async def test_no_retry_on_auth_error(self, client_config, mock_http_client):
-        """Test auth errors don't trigger retry."""
-        mock_response = Mock()
-        mock_response.status_code = 401
-        mock_response.json.return_value = {"error": "Unauthorized"}
-        mock_http_client.request = AsyncMock(return_value=mock_response)
+        with pytest.raises(NetworkError) as exc_info:
+            await client._make_request("GET", "/test")
         
-        client = MCPClient(client_config)
-        
-        with patch('mcp_bigquery.client.mcp_client.httpx.AsyncClient', return_value=mock_http_client):
-            with pytest.raises(AuthenticationError):
-                await client._make_request("GET", "/test")
-            
-            # Should not retry
-            assert mock_http_client.request.call_count == 1
-            mock_http_client.aclose.assert_called_once()
+        exc_info.match(_CONNECTION_FAILED)
+        assert mock_http_client.attempts() == (3, 3)
 
 
+@pytest.mark.usefixtures("_patch_httpx")
 class TestMCPClientMethods:
     """Tests for client API methods."""
     
-    @pytest.mark.asyncio
-    async def test_execute_sql(self, client_config, mock_http_client):
-        """Test execute_sql method."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "rows": [{"col1": "value1"}],
-            "total_rows": 1
-        }
-        mock_http_client.request = AsyncMock(return_value=mock_response)
-        
-        client = MCPClient(client_config)
-        
-        with patch('mcp_bigquery.client.mcp_client.httpx.AsyncClient', return_value=mock_http_client):
-            result = await client.execute_sql("SELECT 1")
-            
-            assert result["rows"] == [{"col1": "value1"}]
-            
-            call_args = mock_http_client.request.call_args
-            assert call_args[1]["method"] == "POST"
-            assert "/tools/execute_bigquery_sql" in call_args[1]["url"]
-            assert call_args[1]["json"]["sql"] == "SELECT 1"
-    
-    @pytest.mark.asyncio
-    async def test_execute_sql_with_options(self, client_config, mock_http_client):
-        """Test execute_sql with custom options."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"rows": []}
-        mock_http_client.request = AsyncMock(return_value=mock_response)
-        
-        client = MCPClient(client_config)
-        
-        with patch('mcp_bigquery.client.mcp_client.httpx.AsyncClient', return_value=mock_http_client):
-            await client.execute_sql(
-                "SELECT 1",
-                maximum_bytes_billed=500000000,
-                use_cache=False
-            )
-            
-            call_args = mock_http_client.request.call_args
-            json_data = call_args[1]["json"]
-            assert json_data["maximum_bytes_billed"] == 500000000
-            assert json_data["use_cache"] is False
-    
-    @pytest.mark.asyncio
-    async def test_list_datasets(self, client_config, mock_http_client):
-        """Test list_datasets method."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "datasets": ["dataset1", "dataset2"]
-        }
-        mock_http_client.request = AsyncMock(return_value=mock_response)
-        
-        client = MCPClient(client_config)
-        
-        with patch('mcp_bigquery.client.mcp_client.httpx.AsyncClient', return_value=mock_http_client):
-            result = await client.list_datasets()
-            
-            assert result["datasets"] == ["dataset1", "dataset2"]
-            
-            call_args = mock_http_client.request.call_args
-            assert call_args[1]["method"] == "GET"
-            assert "/tools/datasets" in call_args[1]["url"]
-    
-    @pytest.mark.asyncio
-    async def test_list_tables(self, client_config, mock_http_client):
-        """Test list_tables method."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "tables": ["table1", "table2"]
-        }
-        mock_http_client.request = AsyncMock(return_value=mock_response)
-        
-        client = MCPClient(client_config)
-        
-        with patch('mcp_bigquery.client.mcp_client.httpx.AsyncClient', return_value=mock_http_client):
-            result = await client.list_tables("my_dataset")
-            
-            assert result["tables"] == ["table1", "table2"]
-            
-            call_args = mock_http_client.request.call_args
-            assert call_args[1]["method"] == "POST"
-            assert "/tools/get_tables" in call_args[1]["url"]
-            assert call_args[1]["json"]["dataset_id"] == "my_dataset"
-    
-    @pytest.mark.asyncio
-    async def test_get_table_schema(self, client_config, mock_http_client):
-        """Test get_table_schema method."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "schema": [{"name": "col1", "type": "STRING"}]
-        }
-        mock_http_client.request = AsyncMock(return_value=mock_response)
-        
-        client = MCPClient(client_config)
-        
-        with patch('mcp_bigquery.client.mcp_client.httpx.AsyncClient', return_value=mock_http_client):
-            result = await client.get_table_schema("my_dataset", "my_table")
-            
-            assert result["schema"] == [{"name": "col1", "type": "STRING"}]
-            
-            call_args = mock_http_client.request.call_args
-            assert call_args[1]["method"] == "POST"
-            assert "/tools/get_table_schema" in call_args[1]["url"]
-            json_data = call_args[1]["json"]
-            assert json_data["dataset_id"] == "my_dataset"
-            assert json_data["table_id"] == "my_table"
-    
-    @pytest.mark.asyncio
-    async def test_explain_table(self, client_config, mock_http_client):
-        """Test explain_table method."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "explanation": "Table details",
-            "usage_stats": {}
-        }
-        mock_http_client.request = AsyncMock(return_value=mock_response)
-        
-        client = MCPClient(client_config)
-        
-        with patch('mcp_bigquery.client.mcp_client.httpx.AsyncClient', return_value=mock_http_client):
-            result = await client.explain_table(
-                "my_project",
-                "my_dataset",
-                "my_table"
-            )
-            
-            assert "explanation" in result
-            
-            call_args = mock_http_client.request.call_args
-            assert call_args[1]["method"] == "POST"
-            assert "/tools/explain_table" in call_args[1]["url"]
-            json_data = call_args[1]["json"]
-            assert json_data["project_id"] == "my_project"
-            assert json_data["dataset_id"] == "my_dataset"
-            assert json_data["table_id"] == "my_table"
-    
-    @pytest.mark.asyncio
-    async def test_get_query_suggestions(self, client_config, mock_http_client):
-        """Test get_query_suggestions method."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "suggestions": ["SELECT * FROM table1"]
-        }
-        mock_http_client.request = AsyncMock(return_value=mock_response)
-        
-        client = MCPClient(client_config)
-        
-        with patch('mcp_bigquery.client.mcp_client.httpx.AsyncClient', return_value=mock_http_client):
-            result = await client.get_query_suggestions(
-                tables_mentioned=["table1"],
-                query_context="Get all rows"
-            )
-            
-            assert "suggestions" in result
-            
-            call_args = mock_http_client.request.call_args
-            json_data = call_args[1]["json"]
-            assert json_data["tables_mentioned"] == ["table1"]
-            assert json_data["query_context"] == "Get all rows"
-    
-    @pytest.mark.asyncio
-    async def test_analyze_query_performance(self, client_config, mock_http_client):
-        """Test analyze_query_performance method."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "analysis": "Performance details"
-        }
-        mock_http_client.request = AsyncMock(return_value=mock_response)
-        
-        client = MCPClient(client_config)
-        
-        with patch('mcp_bigquery.client.mcp_client.httpx.AsyncClient', return_value=mock_http_client):
-            result = await client.analyze_query_performance("SELECT 1")
-            
-            assert "analysis" in result
-            
-            call_args = mock_http_client.request.call_args
-            assert "/tools/analyze_query_performance" in call_args[1]["url"]
-    
-    @pytest.mark.asyncio
-    async def test_get_schema_changes(self, client_config, mock_http_client):
-        """Test get_schema_changes method."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "changes": []
-        }
-        mock_http_client.request = AsyncMock(return_value=mock_response)
-        
-        client = MCPClient(client_config)
-        
-        with patch('mcp_bigquery.client.mcp_client.httpx.AsyncClient', return_value=mock_http_client):
-            result = await client.get_schema_changes(
-                "my_project",
-                "my_dataset",
-                "my_table"
-            )
-            
-            assert "changes" in result
-            
-            call_args = mock_http_client.request.call_args
-            assert call_args[1]["method"] == "GET"
-            params = call_args[1]["params"]
-            assert params["project_id"] == "my_project"
-            assert params["dataset_id"] == "my_dataset"
-            assert params["table_id"] == "my_table"
-    
-    @pytest.mark.asyncio
-    async def test_manage_cache(self, client_config, mock_http_client):
-        """Test manage_cache method."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "result": "Cache cleared"
-        }
-        mock_http_client.request = AsyncMock(return_value=mock_response)
-        
-        client = MCPClient(client_config)
-        
-        with patch('mcp_bigquery.client.mcp_client.httpx.AsyncClient', return_value=mock_http_client):
-            result = await client.manage_cache("clear", target="all")
-            
-            assert result["result"] == "Cache cleared"
-            
-            call_args = mock_http_client.request.call_args
-            json_data = call_args[1]["json"]
-            assert json_data["action"] == "clear"
-            assert json_data["target"] == "all"
+    @pytest.mark.parametrize(
+        "method_name,args,kwargs,payload,exp_http,exp_path,exp_sent_key,exp_sent",
+        [
+            pytest.param(
+                "execute_sql", ("SELECT 1",), {}, _EXEC_SQL_RESP,
+                "POST", "/tools/execute_bigquery_sql", "json", {"sql": "SELECT 1"},
+                id="execute_sql",
+            ),
+            pytest.param(
+                "execute_sql", ("SELECT 1",),
+                {"maximum_bytes_billed": 500000000, "use_cache": False}, _EMPTY_ROWS_RESP,
+                "POST", "/tools/execute_bigquery_sql", "json",
+                {"maximum_bytes_billed": 500000000, "use_cache": False},
+                id="execute_sql_with_options",
+            ),
+            pytest.param(
+                "list_datasets", (), {}, _DATASETS_RESP,
+                "GET", "/tools/datasets", None, None,
+                id="list_datasets",
+            ),
+            pytest.param(
+                "list_tables", ("my_dataset",), {}, _TABLES_RESP,
+                "POST", "/tools/get_tables", "json", {"dataset_id": "my_dataset"},
+                id="list_tables",
+            ),
+            pytest.param(
+                "get_table_schema", ("my_dataset", "my_table"), {}, _SCHEMA_RESP,
+                "POST", "/tools/get_table_schema", "json",
+                {"dataset_id": "my_dataset", "table_id": "my_table"},
+                id="get_table_schema",
+            ),
+            pytest.param(
+                "explain_table", ("my_project", "my_dataset", "my_table"), {}, _EXPLAIN_RESP,
+                "POST", "/tools/explain_table", "json",
+                {"project_id": "my_project", "dataset_id": "my_dataset", "table_id": "my_table"},
+                id="explain_table",
+            ),
+            pytest.param(
+                "get_query_suggestions", (),
+                {"tables_mentioned": ["table1"], "query_context": "Get all rows"}, _SUGGESTIONS_RESP,
+                "POST", "/tools/query_suggestions", "json",
+                {"tables_mentioned": ["table1"], "query_context": "Get all rows"},
+                id="get_query_suggestions",
+            ),
+            pytest.param(
+                "analyze_query_performance", ("SELECT 1",), {}, _ANALYSIS_RESP,
+                "POST", "/tools/analyze_query_performance", "json", {"sql": "SELECT 1"},
+                id="analyze_query_performance",
+            ),
+            pytest.param(
+                "get_schema_changes", ("my_project", "my_dataset", "my_table"), {}, _SCHEMA_CHANGES_RESP,
+                "GET", "/tools/schema_changes", "params",
+                {"project_id": "my_project", "dataset_id": "my_dataset", "table_id": "my_table"},
+                id="get_schema_changes",
+            ),
+            pytest.param(
+                "manage_cache", ("clear",), {"target": "all"}, _CACHE_RESP,
+                "POST", "/tools/manage_cache", "json", {"action": "clear", "target": "all"},
+                id="manage_cache",
+            ),
+        ],
+    )
+    async def test_api_method(
+        self, connected_client, mock_http_client, respond,
+        method_name, args, kwargs, payload, exp_http, exp_path, exp_sent_key, exp_sent
+    ):
+        """Test each API method sends the expected request and returns the body."""
+        respond(payload)
+        
+        result = await getattr(connected_client, method_name)(*args, **kwargs)
+        
+        assert result == payload
+        
+        call_kwargs = mock_http_client.request.call_args[1]
+        assert call_kwargs["method"] == exp_http
+        assert exp_path in call_kwargs["url"]
+        if exp_sent_key is not None:
+            sent = call_kwargs[exp_sent_key]
+            assert {key: sent[key] for key in exp_sent} == exp_sent
 
 
+@pytest.mark.usefixtures("_patch_httpx")
 class TestMCPClientStreaming:
     """Tests for streaming functionality."""
     
-    @pytest.mark.asyncio
-    async def test_stream_events(self, client_config, mock_http_client):
+    async def test_stream_events(self, client, mock_http_client):
         """Test streaming events via NDJSON."""
-        events = [
-            {"type": "connection_established", "client_id": "123"},
-            {"type": "query_started", "query_id": "q1"},
-            {"type": "query_completed", "query_id": "q1"},
-        ]
-        
         async def mock_aiter_lines():
-            for event in events:
-                yield json.dumps(event)
+            for line in _STREAM_LINES:
+                yield line
         
         mock_response = Mock()
         mock_response.status_code = 200
@@ -540,26 +406,18 @@ class TestMCPClientStreaming:
         
         mock_http_client.stream = Mock(return_value=mock_stream)
         
-        client = MCPClient(client_config)
-        
-        with patch('mcp_bigquery.client.mcp_client.httpx.AsyncClient', return_value=mock_http_client):
-            received_events = []
-            async for event in client.stream_events("test_channel"):
-                received_events.append(event)
-            
-            assert len(received_events) == 3
-            assert received_events[0]["type"] == "connection_established"
-            assert received_events[1]["type"] == "query_started"
-            assert received_events[2]["type"] == "query_completed"
+        received_events = [event async for event in client.stream_events("test_channel")]
+        
+        assert len(received_events) == 3
+        assert received_events[0]["type"] == "connection_established"
+        assert received_events[1]["type"] == "query_started"
+        assert received_events[2]["type"] == "query_completed"
     
-    @pytest.mark.asyncio
-    async def test_stream_events_skip_empty_lines(self, client_config, mock_http_client):
+    async def test_stream_events_skip_empty_lines(self, client, mock_http_client):
         """Test streaming skips empty lines (heartbeats)."""
         async def mock_aiter_lines():
-            yield json.dumps({"type": "event1"})
-            yield ""
-            yield "\n"
-            yield json.dumps({"type": "event2"})
+            for line in _HEARTBEAT_STREAM_LINES:
+                yield line
         
         mock_response = Mock()
         mock_response.status_code = 200
@@ -571,19 +429,13 @@ class TestMCPClientStreaming:
         
         mock_http_client.stream = Mock(return_value=mock_stream)
         
-        client = MCPClient(client_config)
+        received_events = [event async for event in client.stream_events()]
         
-        with patch('mcp_bigquery.client.mcp_client.httpx.AsyncClient', return_value=mock_http_client):
-            received_events = []
-            async for event in client.stream_events():
-                received_events.append(event)
-            
-            assert len(received_events) == 2
-            assert received_events[0]["type"] == "event1"
-            assert received_events[1]["type"] == "event2"
+        assert len(received_events) == 2
+        assert received_events[0]["type"] == "event1"
+        assert received_events[1]["type"] == "event2"
     
-    @pytest.mark.asyncio
-    async def test_stream_events_authentication_error(self, client_config, mock_http_client):
+    async def test_stream_events_authentication_error(self, client, mock_http_client):
         """Test streaming raises AuthenticationError on 401."""
         mock_response = Mock()
         mock_response.status_code = 401
@@ -594,55 +446,42 @@ class TestMCPClientStreaming:
         
         mock_http_client.stream = Mock(return_value=mock_stream)
         
-        client = MCPClient(client_config)
-        
-        with patch('mcp_bigquery.client.mcp_client.httpx.AsyncClient', return_value=mock_http_client):
-            with pytest.raises(AuthenticationError):
-                async for event in client.stream_events():
-                    pass
+        with pytest.raises(AuthenticationError):
+            async for event in client.stream_events():
+                pass
     
-    @pytest.mark.asyncio
-    async def test_stream_events_network_error(self, client_config, mock_http_client):
+    async def test_stream_events_network_error(self, client, mock_http_client):
         """Test streaming raises NetworkError on connection failure."""
         mock_http_client.stream = Mock(
             side_effect=httpx.NetworkError("Connection failed")
         )
         
-        client = MCPClient(client_config)
-        
-        with patch('mcp_bigquery.client.mcp_client.httpx.AsyncClient', return_value=mock_http_client):
-            with pytest.raises(NetworkError):
-                async for event in client.stream_events():
-                    pass
+        with pytest.raises(NetworkError):
+            async for event in client.stream_events():
+                pass
 
 
 class TestErrorExtraction:
     """Tests for error message extraction."""
     
-    def test_extract_error_with_error_field(self, client_config):
+    def test_extract_error_with_error_field(self, client):
         """Test extracting error from 'error' field."""
-        client = MCPClient(client_config)
-        
         response = Mock()
-        response.json.return_value = {"error": "Something went wrong"}
+        response.json = lambda: {"error": "Something went wrong"}
         
         error_msg = client._extract_error(response)
         assert error_msg == "Something went wrong"
     
-    def test_extract_error_with_detail_field(self, client_config):
+    def test_extract_error_with_detail_field(self, client):
         """Test extracting error from 'detail' field."""
-        client = MCPClient(client_config)
-        
         response = Mock()
-        response.json.return_value = {"detail": "Validation failed"}
+        response.json = lambda: {"detail": "Validation failed"}
         
         error_msg = client._extract_error(response)
         assert error_msg == "Validation failed"
     
-    def test_extract_error_fallback_to_text(self, client_config):
+    def test_extract_error_fallback_to_text(self, client):
         """Test fallback to response text."""
-        client = MCPClient(client_config)
-        
         response = Mock()
         response.json.side_effect = Exception("Not JSON")
         response.text = "Error text"
@@ -651,10 +490,8 @@ class TestErrorExtraction:
         error_msg = client._extract_error(response)
         assert error_msg == "Error text"
     
-    def test_extract_error_empty_text(self, client_config):
+    def test_extract_error_empty_text(self, client):
         """Test fallback when text is empty."""
-        client = MCPClient(client_config)
-        
         response = Mock()
         response.json.side_effect = Exception("Not JSON")
         response.text = ""
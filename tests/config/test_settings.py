@@ -2,12 +2,11 @@
 
 import pytest
 import os
-import tempfile
 import json
 from unittest.mock import patch
 from pydantic import ValidationError
 
-from mcp_bigquery.config.settings import ServerConfig
+from mcp_bigquery.config.settings import ServerConfig, _validate_key_file, clear_key_file_cache
 
 
 class TestServerConfigValidation:
@@ -48,53 +47,40 @@ class TestServerConfigValidation:
 class TestServerConfigKeyFile:
     """Tests for key file validation."""
     
-    def test_valid_key_file(self):
+    def test_valid_key_file(self, valid_key_file):
         """Test config with valid key file."""
-        # Create a temporary key file
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.json') as f:
-            json.dump({
-                "type": "service_account",
-                "project_id": "my-project",
-                "private_key": "test-key"
-            }, f)
-            key_file = f.name
-        
-        try:
-            config = ServerConfig(project_id="my-project", key_file=key_file)
-            assert config.key_file == key_file
-        finally:
-            os.unlink(key_file)
+        config = ServerConfig(project_id="my-project", key_file=valid_key_file)
+        assert config.key_file == valid_key_file
     
     def test_nonexistent_key_file_fails(self):
         """Test that nonexistent key file fails validation."""
         with pytest.raises(ValidationError, match="not found or inaccessible"):
             ServerConfig(project_id="my-project", key_file="/nonexistent/file.json")
     
-    def test_invalid_key_file_format_fails(self):
+    def test_invalid_key_file_format_fails(self, invalid_format_key_file):
         """Test that invalid key file format fails validation."""
-        # Create a temporary key file with invalid format
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.json') as f:
-            json.dump({"invalid": "format"}, f)
-            key_file = f.name
-        
-        try:
-            with pytest.raises(ValidationError, match="Invalid service account key file format"):
-                ServerConfig(project_id="my-project", key_file=key_file)
-        finally:
-            os.unlink(key_file)
+        with pytest.raises(ValidationError, match="Invalid service account key file format"):
+            ServerConfig(project_id="my-project", key_file=invalid_format_key_file)
     
-    def test_invalid_json_key_file_fails(self):
+    def test_invalid_json_key_file_fails(self, invalid_json_key_file):
         """Test that malformed JSON in key file fails validation."""
-        # Create a temporary key file with invalid JSON
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.json') as f:
-            f.write("not valid json{")
-            key_file = f.name
+        with pytest.raises(ValidationError, match="not valid JSON"):
+            ServerConfig(project_id="my-project", key_file=invalid_json_key_file)
+    
+    def test_key_file_check_cached_until_file_changes(self, tmp_path):
+        """Test the key file is re-read only when its stat changes."""
+        key_file = tmp_path / "key.json"
+        key_file.write_text(json.dumps({"type": "service_account", "project_id": "my-project"}))
+        clear_key_file_cache()
+        
+        ServerConfig(project_id="my-project", key_file=str(key_file))
+        ServerConfig(project_id="my-project", key_file=str(key_file))
+        assert _validate_key_file.cache_info().misses == 1
+        assert _validate_key_file.cache_info().hits == 1
         
-        try:
-            with pytest.raises(ValidationError, match="not valid JSON"):
-                ServerConfig(project_id="my-project", key_file=key_file)
-        finally:
-            os.unlink(key_file)
+        key_file.write_text(json.dumps({"invalid": "format"}))
+        with pytest.raises(ValidationError, match="Invalid service account key file format"):
+            ServerConfig(project_id="my-project", key_file=str(key_file))
 
 
 class TestServerConfigSupabase:
@@ -0,0 +1,57 @@
+"""Shared pytest configuration for the test suite."""
+
+import json
+
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--runslow",
+        action="store_true",
+        default=False,
+        help="run tests marked as slow",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--runslow"):
+        return
+    skip_slow = pytest.mark.skip(reason="need --runslow option to run")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
+@pytest.fixture(scope="session")
+def key_file_dir(tmp_path_factory):
+    """Directory holding the session's service account key files."""
+    return tmp_path_factory.mktemp("keys")
+
+
+@pytest.fixture(scope="session")
+def valid_key_file(key_file_dir):
+    """Path to a well-formed service account key file."""
+    path = key_file_dir / "valid.json"
+    path.write_text(json.dumps({
+        "type": "service_account",
+        "project_id": "my-project",
+        "private_key": "test-key"
+    }))
+    return str(path)
+
+
+@pytest.fixture(scope="session")
+def invalid_format_key_file(key_file_dir):
+    """Path to a JSON key file that is not a service account key."""
+    path = key_file_dir / "invalid_format.json"
+    path.write_text(json.dumps({"invalid": "format"}))
+    return str(path)
+
+
+@pytest.fixture(scope="session")
+def invalid_json_key_file(key_file_dir):
+    """Path to a key file containing malformed JSON."""
+    path = key_file_dir / "invalid_json.json"
+    path.write_text("not valid json{")
+    return str(path)
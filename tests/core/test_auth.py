@@ -52,22 +52,21 @@ def expired_token(jwt_secret):
 def mock_supabase_kb():
     """Mock SupabaseKnowledgeBase for testing."""
     kb = MagicMock()
-    kb.get_user_profile = AsyncMock(return_value={
-        "user_id": "user-123",
-        "metadata": {"name": "Test User"}
+    kb.get_user_authz_bundle = AsyncMock(return_value={
+        "profile": {"user_id": "user-123", "metadata": {"name": "Test User"}},
+        "roles": [
+            {"user_id": "user-123", "role_id": "role-1", "role_name": "analyst"},
+            {"user_id": "user-123", "role_id": "role-2", "role_name": "viewer"}
+        ],
+        "permissions": [
+            {"role_id": "role-1", "permission": "query:execute"},
+            {"role_id": "role-1", "permission": "cache:read"}
+        ],
+        "datasets": [
+            {"role_id": "role-1", "dataset_id": "public_data", "table_id": None},
+            {"role_id": "role-1", "dataset_id": "analytics", "table_id": "events"}
+        ],
     })
-    kb.get_user_roles = AsyncMock(return_value=[
-        {"user_id": "user-123", "role_id": "role-1", "role_name": "analyst"},
-        {"user_id": "user-123", "role_id": "role-2", "role_name": "viewer"}
-    ])
-    kb.get_role_permissions = AsyncMock(return_value=[
-        {"role_id": "role-1", "permission": "query:execute"},
-        {"role_id": "role-1", "permission": "cache:read"}
-    ])
-    kb.get_role_dataset_access = AsyncMock(return_value=[
-        {"role_id": "role-1", "dataset_id": "public_data", "table_id": None},
-        {"role_id": "role-1", "dataset_id": "analytics", "table_id": "events"}
-    ])
     return kb
 
 
@@ -295,9 +294,8 @@ class TestUserContextAsync:
         # Verify table access
         assert context.can_access_table("analytics", "events")
         
-        # Verify Supabase KB was called
-        mock_supabase_kb.get_user_profile.assert_called_once_with("user-123")
-        mock_supabase_kb.get_user_roles.assert_called_once_with("user-123")
+        # Verify Supabase KB was called once for all RBAC data
+        mock_supabase_kb.get_user_authz_bundle.assert_awaited_once_with("user-123")
     
     @pytest.mark.asyncio
     async def test_from_token_async_expired(self, expired_token, jwt_secret):
@@ -353,26 +351,3 @@ class TestRoleCache:
         
         # Expired entry should be removed
         assert cache_key not in _role_cache
-
-
-@pytest.mark.asyncio
-async def test_supabase_kb_integration(mock_supabase_kb):
-    """Test integration with SupabaseKnowledgeBase."""
-    # Test get_user_profile
-    profile = await mock_supabase_kb.get_user_profile("user-123")
-    assert profile["user_id"] == "user-123"
-    
-    # Test get_user_roles
-    roles = await mock_supabase_kb.get_user_roles("user-123")
-    assert len(roles) == 2
-    assert roles[0]["role_name"] == "analyst"
-    
-    # Test get_role_permissions
-    permissions = await mock_supabase_kb.get_role_permissions("role-1")
-    assert len(permissions) == 2
-    assert permissions[0]["permission"] == "query:execute"
-    
-    # Test get_role_dataset_access
-    access = await mock_supabase_kb.get_role_dataset_access("role-1")
-    assert len(access) == 2
-    assert access[0]["dataset_id"] == "public_data"
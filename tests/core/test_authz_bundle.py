@@ -0,0 +1,137 @@
+"""Tests for SupabaseKnowledgeBase.get_user_authz_bundle."""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from mcp_bigquery.core.auth import clear_role_cache
+from mcp_bigquery.core.supabase_client import SupabaseKnowledgeBase
+
+
+_PROFILE = {"user_id": "user-123", "metadata": {"department": "analytics"}}
+_ROLES = [
+    {"user_id": "user-123", "role_id": "role-1", "role_name": "analyst"},
+    {"user_id": "user-123", "role_id": "role-2", "role_name": "viewer"},
+]
+_PERMISSIONS = [
+    {"role_id": "role-1", "permission": "query:execute"},
+    {"role_id": "role-2", "permission": "cache:read"},
+]
+_DATASETS = [
+    {"role_id": "role-1", "dataset_id": "public_data", "table_id": None},
+    {"role_id": "role-2", "dataset_id": "analytics", "table_id": "events"},
+]
+
+
+def _query_builder(data):
+    """Chainable query builder whose execute() returns ``data``."""
+    builder = MagicMock()
+    builder.select = MagicMock(return_value=builder)
+    builder.eq = MagicMock(return_value=builder)
+    builder.in_ = MagicMock(return_value=builder)
+    builder.limit = MagicMock(return_value=builder)
+    builder.execute = MagicMock(return_value=MagicMock(data=data))
+    return builder
+
+
+@pytest.fixture
+def tables():
+    """One query builder per RBAC table."""
+    return {
+        "user_profiles": _query_builder([_PROFILE]),
+        "user_roles": _query_builder(_ROLES),
+        "role_permissions": _query_builder(_PERMISSIONS),
+        "role_dataset_access": _query_builder(_DATASETS),
+    }
+
+
+@pytest.fixture
+def mock_supabase_client(tables):
+    """Create a mock Supabase client routing table() to the per-table builders."""
+    client = MagicMock()
+    client.table = MagicMock(side_effect=lambda name: tables[name])
+    return client
+
+
+@pytest.fixture
+def knowledge_base(mock_supabase_client):
+    """Create a SupabaseKnowledgeBase instance with mocked client."""
+    with patch.dict('os.environ', {
+        'SUPABASE_URL': 'https://test.supabase.co',
+        'SUPABASE_SERVICE_KEY': 'test-key'
+    }):
+        kb = SupabaseKnowledgeBase()
+        kb.supabase = mock_supabase_client
+        kb._connection_verified = True
+        return kb
+
+
+@pytest.fixture(autouse=True)
+def _clear_role_cache():
+    """Start and end every test with an empty role cache."""
+    clear_role_cache()
+    yield
+    clear_role_cache()
+
+
+async def test_bundle_batches_role_queries(knowledge_base, tables):
+    """Test permissions and dataset access are fetched with one IN query each."""
+    bundle = await knowledge_base.get_user_authz_bundle("user-123")
+
+    assert bundle == {
+        "profile": _PROFILE,
+        "roles": _ROLES,
+        "permissions": _PERMISSIONS,
+        "datasets": _DATASETS,
+    }
+    tables["user_profiles"].eq.assert_called_once_with("user_id", "user-123")
+    tables["user_roles"].eq.assert_called_once_with("user_id", "user-123")
+    for name in ("role_permissions", "role_dataset_access"):
+        tables[name].in_.assert_called_once_with("role_id", ["role-1", "role-2"])
+        tables[name].eq.assert_not_called()
+        tables[name].execute.assert_called_once()
+
+
+async def test_bundle_without_roles_skips_role_queries(knowledge_base, tables, mock_supabase_client):
+    """Test a user with no roles never queries permissions or dataset access."""
+    tables["user_roles"].execute.return_value = MagicMock(data=[])
+
+    bundle = await knowledge_base.get_user_authz_bundle("user-123")
+
+    assert bundle == {"profile": _PROFILE, "roles": [], "permissions": [], "datasets": []}
+    queried = [call.args[0] for call in mock_supabase_client.table.call_args_list]
+    assert queried == ["user_profiles", "user_roles"]
+
+
+async def test_bundle_cached_per_user(knowledge_base, mock_supabase_client):
+    """Test a second call for the same user is served from the role cache."""
+    first = await knowledge_base.get_user_authz_bundle("user-123")
+    calls = mock_supabase_client.table.call_count
+
+    second = await knowledge_base.get_user_authz_bundle("user-123")
+
+    assert second == first
+    assert mock_supabase_client.table.call_count == calls
+
+
+async def test_bundle_query_error_returns_partial_and_is_not_cached(knowledge_base, tables):
+    """Test a failed query keeps the rows fetched before it and is retried next time."""
+    tables["role_permissions"].execute.side_effect = Exception("Supabase timeout")
+
+    bundle = await knowledge_base.get_user_authz_bundle("user-123")
+
+    assert bundle == {"profile": _PROFILE, "roles": _ROLES, "permissions": [], "datasets": []}
+    tables["role_dataset_access"].execute.assert_not_called()
+
+    tables["role_permissions"].execute.side_effect = None
+    bundle = await knowledge_base.get_user_authz_bundle("user-123")
+    assert bundle["permissions"] == _PERMISSIONS
+
+
+async def test_bundle_connection_unavailable(knowledge_base, mock_supabase_client):
+    """Test an unreachable Supabase yields an empty bundle without queries."""
+    knowledge_base.verify_connection = AsyncMock(return_value=False)
+
+    bundle = await knowledge_base.get_user_authz_bundle("user-123")
+
+    assert bundle == {"profile": None, "roles": [], "permissions": [], "datasets": []}
+    mock_supabase_client.table.assert_not_called()
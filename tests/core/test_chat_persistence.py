@@ -348,7 +348,7 @@ async def test_fetch_chat_history_unauthorized(knowledge_base, mock_supabase_cli
     
     result = await knowledge_base.fetch_chat_history(session_id, user_id)
     
-    assert result == []
+    assert result is None
 
 
 @pytest.mark.asyncio
@@ -365,7 +365,28 @@ async def test_fetch_chat_history_not_found(knowledge_base, mock_supabase_client
     
     result = await knowledge_base.fetch_chat_history(session_id, user_id)
     
-    assert result == []
+    assert result is None
+
+
+@pytest.mark.asyncio
+async def test_fetch_chat_history_query_error_propagates(knowledge_base, mock_supabase_client):
+    """Test a failed query raises instead of looking like a missing session."""
+    session_id = str(uuid4())
+    user_id = "user-123"
+    
+    mock_supabase_client.table("chat_sessions").select.return_value.eq.return_value.limit.return_value.execute.side_effect = Exception("Supabase timeout")
+    
+    with pytest.raises(Exception, match="Supabase timeout"):
+        await knowledge_base.fetch_chat_history(session_id, user_id)
+
+
+@pytest.mark.asyncio
+async def test_fetch_chat_history_connection_unavailable(knowledge_base):
+    """Test an unreachable Supabase raises ConnectionError."""
+    knowledge_base.verify_connection = AsyncMock(return_value=False)
+    
+    with pytest.raises(ConnectionError):
+        await knowledge_base.fetch_chat_history(str(uuid4()), "user-123")
 
 
 @pytest.mark.asyncio
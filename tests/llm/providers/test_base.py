@@ -63,6 +63,27 @@ class TestToolCall:
         tool_call = ToolCall(id="call_456", name="list_users")
         assert tool_call.arguments == {}
 
+    def test_tool_call_openai_dict(self):
+        """Test OpenAI-format dict is compact and built fresh per access."""
+        tool_call = ToolCall(id="call_789", name="get_weather", arguments={"location": "SF"})
+        assert tool_call.openai_dict == {
+            "id": "call_789",
+            "type": "function",
+            "function": {"name": "get_weather", "arguments": '{"location":"SF"}'},
+        }
+        assert tool_call.openai_dict is not tool_call.openai_dict
+    
+    def test_tool_call_openai_dict_tracks_changes(self):
+        """Test OpenAI-format dict reflects copies and field updates."""
+        tool_call = ToolCall(id="call_789", name="get_weather", arguments={"location": "SF"})
+        tool_call.openai_dict
+        
+        copy = tool_call.model_copy(update={"arguments": {"location": "NYC"}})
+        assert copy.openai_dict["function"]["arguments"] == '{"location":"NYC"}'
+        
+        tool_call.name = "get_forecast"
+        assert tool_call.openai_dict["function"]["name"] == "get_forecast"
+
 
 class TestToolDefinition:
     """Tests for ToolDefinition model."""
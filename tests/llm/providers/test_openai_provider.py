@@ -10,6 +10,7 @@ from mcp_bigquery.llm.providers import (
     LLMConfigurationError,
     LLMGenerationError,
     Message,
+    ToolCall,
     ToolDefinition,
 )
 
@@ -160,6 +161,37 @@ class TestOpenAIProviderGeneration:
         assert response.tool_calls[0].name == "get_weather"
         assert response.tool_calls[0].arguments["location"] == "SF"
     
+    @pytest.mark.asyncio
+    @patch('mcp_bigquery.llm.providers.openai_provider.AsyncOpenAI')
+    async def test_generate_encodes_tool_call_arguments_compactly(self, mock_openai_class, openai_config):
+        """Test assistant tool call arguments are sent as compact JSON."""
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = "Done"
+        mock_response.choices[0].message.tool_calls = None
+        mock_response.choices[0].finish_reason = "stop"
+        mock_response.usage = None
+        
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+        mock_openai_class.return_value = mock_client
+        
+        provider = OpenAIProvider(openai_config)
+        
+        messages = [
+            Message(role="user", content="What's the weather?"),
+            Message(
+                role="assistant",
+                tool_calls=[ToolCall(id="call_1", name="get_weather", arguments={"location": "São Paulo"})],
+            ),
+            Message(role="tool", content="Sunny", tool_call_id="call_1"),
+        ]
+        await provider.generate(messages)
+        
+        sent = mock_client.chat.completions.create.call_args.kwargs["messages"]
+        assert sent[1]["tool_calls"][0]["function"]["arguments"] == '{"location":"São Paulo"}'
+        assert sent[2]["tool_call_id"] == "call_1"
+    
     @pytest.mark.asyncio
     @patch('mcp_bigquery.llm.providers.openai_provider.AsyncOpenAI')
     async def test_generate_api_error(self, mock_openai_class, openai_config):